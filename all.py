@@ -1,10 +1,18 @@
-import math
 import random
 import time
 import uuid
 import datetime
 import json
 
+try:
+    import numpy as np
+except ImportError:  # trajectories are then generated step by step
+    np = None
+
+import geodesy
+from geodesy import haversine, bearing, move_point
+from radar_coverage import RadarCoverageIndex
+
 
 # Define radars with their positions and ranges
 RADARS = [
@@ -28,46 +36,76 @@ RADARS = [
     }
 ]
 
+# Coverage lookups go through a grid index; rebuild it after changing RADARS
+RADAR_INDEX = RadarCoverageIndex(RADARS)
+
+
+def radar_cache_params():
+    """
+    The radar set as scenario cache parameters
+
+    Generated tracks carry radar detections, so cached tracks are keyed by the radars too
+    and are regenerated when RADARS changes.
+    """
+    return [{"name": radar["name"], "lat": radar["lat"], "lng": radar["lng"], "range": radar["range"]}
+            for radar in RADARS]
+
+
+def is_straight_behavior(object_type, behavior):
+    """
+    Whether simulate_aircraft flies this object straight at constant speed and altitude
+    (drone, rocket, plane, chill jet), i.e. without random per-step adjustments
+    """
+    if object_type in ("bird", "helicopter"):
+        return False
+    return not (object_type == "jet" and behavior == "aggressive")
+
+
+def straight_track_steps(start, end, step_distance, total_distance, speed_kts, altitude):
+    """
+    Compute the steps of a straight track toward the end point in one batch (needs NumPy)
 
-# Haversine formula
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371000
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    d_phi = math.radians(lat2 - lat1)
-    d_lambda = math.radians(lon2 - lon1)
-    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+    Every step re-aims at the end point, which keeps the track on the start-end great
+    circle, so step k is the point k * step_distance along it. Only the steps that are
+    at least one step short of the end point are returned; the approach itself (and its
+    stop condition) is left to the stepwise loop.
 
+    Args:
+        start: Start point {"lat", "lon"}
+        end: End point {"lat", "lon"}
+        step_distance: Distance covered per step in meters
+        total_distance: Start to end distance in meters
+        speed_kts: Constant speed, copied into every step
+        altitude: Constant altitude, copied into every step
+
+    Returns:
+        List of (lat, lon, bearing, speed_kts, altitude) tuples, one per step
+    """
+    count = int(total_distance // step_distance) - 1 if step_distance > 0 else 0
+    if count <= 0:
+        return []
 
-# Bearing between points
-def bearing(lat1, lon1, lat2, lon2):
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    delta_lambda = math.radians(lon2 - lon1)
-    y = math.sin(delta_lambda) * math.cos(phi2)
-    x = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(delta_lambda)
-    return (math.degrees(math.atan2(y, x)) + 360) % 360
+    start_bearing = bearing(start['lat'], start['lon'], end['lat'], end['lon'])
+    lats, lons = geodesy.move_point_array(start['lat'], start['lon'],
+                                          step_distance * np.arange(1, count + 1), start_bearing)
 
+    # Bearing of step k is aimed from the point before it (the start for step 1)
+    from_lats = np.concatenate(([start['lat']], lats[:-1]))
+    from_lons = np.concatenate(([start['lon']], lons[:-1]))
+    bearings = geodesy.bearing_array(from_lats, from_lons, end['lat'], end['lon'])
 
-# Move point
-def move_point(lat, lon, speed, brg, dt=1):
-    R = 6371000
-    distance = speed * dt
-    brg = math.radians(brg)
-    lat1, lon1 = math.radians(lat), math.radians(lon)
-    lat2 = math.asin(math.sin(lat1) * math.cos(distance / R) + math.cos(lat1) * math.sin(distance / R) * math.cos(brg))
-    lon2 = lon1 + math.atan2(math.sin(brg) * math.sin(distance / R) * math.cos(lat1),
-                             math.cos(distance / R) - math.sin(lat1) * math.sin(lat2))
-    return math.degrees(lat2), math.degrees(lon2)
+    return [(lat, lon, brg, speed_kts, altitude)
+            for lat, lon, brg in zip(lats.tolist(), lons.tolist(), bearings.tolist())]
 
 
 # Check which radars detect a point
 def get_detecting_radars(lat, lon):
     """
     Returns list of radars that can detect the given position
+    Only radars whose range reaches the point's RADAR_INDEX cell are checked (and logged)
     """
     detecting_radars = []
-    for radar in RADARS:
+    for radar, _ in RADAR_INDEX.candidates(lat, lon):
         distance = haversine(lat, lon, radar["lat"], radar["lng"])
         distance_km = distance / 1000
         if distance <= radar["range"]:
@@ -79,7 +117,7 @@ def get_detecting_radars(lat, lon):
 
 
 # Add random deviation to a point (backward from direction of travel)
-def add_position_deviation(lat, lon, bearing, radar_index, total_radars, max_deviation_meters=100):
+def add_position_deviation(lat, lon, bearing, radar_index, total_radars, max_deviation_meters=100, rng=None):
     """
     Add random deviation to a position (simulates radar detection uncertainty)
     The deviation is behind the actual position (opposite to direction of travel)
@@ -92,7 +130,10 @@ def add_position_deviation(lat, lon, bearing, radar_index, total_radars, max_dev
         radar_index: index of this radar (0 = first, will be furthest behind)
         total_radars: total number of radars detecting this point
         max_deviation_meters: maximum deviation in meters (default 100m)
+        rng: random.Random to draw the deviation from (default: the global random module)
     """
+    rng = rng or random
+
     # Calculate backward distance based on radar index
     # First radar (index 0) is furthest behind, last radar is closest
     # Distance range: 30m to 150m behind
@@ -111,10 +152,10 @@ def add_position_deviation(lat, lon, bearing, radar_index, total_radars, max_dev
     behind_distance = min_behind_distance + (max_behind_distance - min_behind_distance) * behind_factor
     
     # Add some random variation to the behind distance (±10%)
-    behind_distance *= random.uniform(0.9, 1.1)
+    behind_distance *= rng.uniform(0.9, 1.1)
     
     # Calculate perpendicular deviation (left/right from direction)
-    perpendicular_deviation = random.uniform(-max_deviation_meters, max_deviation_meters)
+    perpendicular_deviation = rng.uniform(-max_deviation_meters, max_deviation_meters)
     
     # Backward angle (opposite to bearing)
     backward_bearing = (bearing + 180) % 360
@@ -130,15 +171,19 @@ def add_position_deviation(lat, lon, bearing, radar_index, total_radars, max_dev
 
 
 # Generate radar detection points for a given point
-def generate_radar_detections(point, point_idx):
+def generate_radar_detections(point, point_idx, rng=None, detecting_radars=None):
     """
     Generate radar detection points for a given point.
     Returns a list of detection points, one for each detecting radar.
     If multiple radars detect it, adds 0.5s delay between detections.
     Detection points are positioned behind the actual position (opposite to direction of travel).
     Later detections (higher timestamp) are closer to the actual position.
+    Position deviations are drawn from rng (default: the global random module).
+    Pass detecting_radars when the radars were already looked up for the whole track
+    (RADAR_INDEX.detect_many), otherwise they are looked up here.
     """
-    detecting_radars = get_detecting_radars(point["lat"], point["lon"])
+    if detecting_radars is None:
+        detecting_radars = get_detecting_radars(point["lat"], point["lon"])
     
     if not detecting_radars:
         return []  # No radar detects this point
@@ -160,7 +205,8 @@ def generate_radar_detections(point, point_idx):
             point["lon"], 
             bearing, 
             i, 
-            total_radars
+            total_radars,
+            rng=rng
         )
         
         detection_point = {
@@ -184,10 +230,28 @@ def generate_radar_detections(point, point_idx):
 
 # Aircraft simulator
 def simulate_aircraft(start, end, min_speed_kts, max_speed_kts, min_alt_ft, max_alt_ft, object_type, color,
-                      behavior="normal", name=None):
-    cruise_speed_kts = random.uniform(min_speed_kts, max_speed_kts)
+                      behavior="normal", name=None, seed=None, base_time=None):
+    """
+    Simulate one track from start to end with 10 second steps, plus its radar detections
+
+    Args:
+        start, end: {'lat', 'lon'} of the first and last position
+        min_speed_kts, max_speed_kts: range of the cruise speed
+        min_alt_ft, max_alt_ft: range of the altitude
+        object_type, color, behavior, name: describe the object and how it moves
+        seed: Seed for every random choice of the track (default: a fresh random track)
+        base_time: Naive UTC time of the first point (default: now)
+
+    Returns:
+        Course dict with its points; the same seed and base_time give the same course
+    """
+    rng = random.Random(seed)
+    if base_time is None:
+        base_time = datetime.datetime.utcnow()
+
+    cruise_speed_kts = rng.uniform(min_speed_kts, max_speed_kts)
     cruise_speed = cruise_speed_kts * 0.514444
-    altitude = random.uniform(min_alt_ft, max_alt_ft)
+    altitude = rng.uniform(min_alt_ft, max_alt_ft)
     total_distance = haversine(start['lat'], start['lon'], end['lat'], end['lon'])
 
     # Initial logging
@@ -200,53 +264,79 @@ def simulate_aircraft(start, end, min_speed_kts, max_speed_kts, min_alt_ft, max_
     print(f"Altitude: {altitude:.2f} feet")
     print(f"{'='*60}")
 
-    points = []
-    timestamp = datetime.datetime.utcnow()
+    # Move along the track: (lat, lon, bearing, speed_kts, altitude) after every 10s step
+    steps = []
     current_lat, current_lon = start['lat'], start['lon']
-    prev_bearing, prev_speed = None, None
-    total_dir_changes, total_speed_changes, total_alt_changes = 0, 0, 0
-    point_idx = 0
-    d= 0
+    prev_bearing = None
+    d = 0
+    if np is not None and is_straight_behavior(object_type, behavior):
+        # Straight, constant-speed tracks: compute every step that cannot reach the end point
+        # in one batch, then let the stepwise loop below finish the approach
+        steps = straight_track_steps(start, end, cruise_speed * 10, total_distance, cruise_speed_kts, altitude)
+        if steps:
+            current_lat, current_lon, prev_bearing = steps[-1][:3]
+        if len(steps) > 1:
+            d = abs(steps[-1][2] - steps[-2][2])
+            if d > 180: d = 360 - d
+
     while haversine(current_lat, current_lon, end['lat'], end['lon']) > cruise_speed and d < 100:
         brg = bearing(current_lat, current_lon, end['lat'], end['lon'])
 
         # Behavior adjustments
         if object_type == "bird":
             # dynamic altitude
-            altitude += random.uniform(-200, 200)
+            altitude += rng.uniform(-200, 200)
             if altitude < 0: altitude = 0
         elif object_type == "helicopter":
             # slight altitude variation
-            altitude += random.uniform(-50, 50)
+            altitude += rng.uniform(-50, 50)
             altitude = max(100, min(altitude, max_alt_ft))
         elif object_type == "jet" and behavior == "aggressive":
             # strong random turns, speed, altitude changes
-            brg += random.uniform(-45, 45)
-            cruise_speed_kts += random.uniform(-50, 50)
+            brg += rng.uniform(-45, 45)
+            cruise_speed_kts += rng.uniform(-50, 50)
             cruise_speed_kts = max(min_speed_kts, min(cruise_speed_kts, max_speed_kts))
             cruise_speed = cruise_speed_kts * 0.514444
-            altitude += random.uniform(-500, 500)
+            altitude += rng.uniform(-500, 500)
             altitude = max(min_alt_ft, min(altitude, max_alt_ft))
         # else: drone, rocket, plane, jet chill -> straight, constant
 
         current_lat, current_lon = move_point(current_lat, current_lon, cruise_speed, brg, dt=10)
 
+        if prev_bearing is not None:
+            d = abs(brg - prev_bearing)
+            if d > 180: d = 360 - d
+        steps.append((current_lat, current_lon, brg, cruise_speed_kts, altitude))
+        prev_bearing = brg
+
+    # Calculate remaining distances
+    if np is not None and steps:
+        step_array = np.array([step[:2] for step in steps])
+        remaining_distances = geodesy.haversine_array(step_array[:, 0], step_array[:, 1],
+                                                      end['lat'], end['lon']).tolist()
+    else:
+        remaining_distances = [haversine(step[0], step[1], end['lat'], end['lon']) for step in steps]
+
+    points = []
+    timestamp = base_time
+    prev_bearing, prev_speed = None, None
+    total_dir_changes, total_speed_changes, total_alt_changes = 0, 0, 0
+    for point_idx, (step, remaining_distance) in enumerate(zip(steps, remaining_distances)):
+        current_lat, current_lon, brg, point_speed_kts, point_altitude = step
+
         # Track stats
         if prev_bearing is not None:
             d = abs(brg - prev_bearing)
             if d > 180: d = 360 - d
             total_dir_changes += d
         if prev_speed is not None:
-            total_speed_changes += abs(cruise_speed_kts - prev_speed)
+            total_speed_changes += abs(point_speed_kts - prev_speed)
         if points:
-            total_alt_changes += abs(altitude - points[-1]['altitude'])
+            total_alt_changes += abs(point_altitude - points[-1]['altitude'])
 
-        # Calculate remaining distance
-        remaining_distance = haversine(current_lat, current_lon, end['lat'], end['lon'])
-        
         # Log every point
         print(f"Point {point_idx}: lat={current_lat:.6f}, lon={current_lon:.6f}, "
-              f"alt={altitude:.0f}ft, speed={cruise_speed_kts:.1f}kts, "
+              f"alt={point_altitude:.0f}ft, speed={point_speed_kts:.1f}kts, "
               f"bearing={brg:.1f}°, remaining={remaining_distance:.0f}m")
 
         # Calculate rotation (bearing - 90 for correct orientation)
@@ -256,30 +346,32 @@ def simulate_aircraft(start, end, min_speed_kts, max_speed_kts, min_alt_ft, max_
             "timestamp": timestamp.isoformat() + "+00:00",
             "lat": current_lat,
             "lon": current_lon,
-            "altitude": altitude,
-            "speed_kts": cruise_speed_kts,
+            "altitude": point_altitude,
+            "speed_kts": point_speed_kts,
             "bearing": brg,
             "rotation": rotation,
             "point_id": f"p{point_idx}"
         })
 
         prev_bearing = brg
-        prev_speed = cruise_speed_kts
+        prev_speed = point_speed_kts
         timestamp += datetime.timedelta(seconds=10)
-        point_idx += 1
 
     # Generate radar detection points for each original point
     print(f"\nGenerating radar detections...")
     all_points_with_radar = []
     total_detections = 0
+    detected_points = points[:100]  # Only process first 100 points
+    coverage = RADAR_INDEX.detect_many([p["lat"] for p in detected_points], [p["lon"] for p in detected_points])
     
-    for point in points[:100]:  # Only process first 100 points
+    for point, detecting_radars in zip(detected_points, coverage):
         # Add the original point
         all_points_with_radar.append(point)
         
         # Generate and add radar detection points
         print(f"\n  Processing Point {point['point_id']} at lat={point['lat']:.4f}, lon={point['lon']:.4f}:")
-        detections = generate_radar_detections(point, point["point_id"])
+        detections = generate_radar_detections(point, point["point_id"], rng=rng,
+                                               detecting_radars=detecting_radars)
         all_points_with_radar.extend(detections)
         if detections:
             total_detections += len(detections)
@@ -305,11 +397,11 @@ def simulate_aircraft(start, end, min_speed_kts, max_speed_kts, min_alt_ft, max_
     print(f"{'*'*60}\n")
 
     result = {
-        "_id": str(uuid.uuid4()),
+        "_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
         "object_type": object_type,
         "color_on_map": color,
-        "created_at": datetime.datetime.utcnow().isoformat() + "+00:00",
-        "updated_at": datetime.datetime.utcnow().isoformat() + "+00:00",
+        "created_at": base_time.isoformat() + "+00:00",
+        "updated_at": base_time.isoformat() + "+00:00",
         "avg_speed": cruise_speed_kts,
         "altitude": altitude,
         "starting_point": start,
@@ -382,7 +474,7 @@ def send_radar_points_with_timing(api_url):
     Send radar points with proper timing: first at 10s, then +1s for each subsequent
     Returns the positions for later use in the moving object simulation
     """
-    import requests
+    import transport
     
     positions = [
         {"lat": 33.261657, "lon": 35.419922, "alt": 5000},
@@ -405,7 +497,7 @@ def send_radar_points_with_timing(api_url):
         }
         
         try:
-            response = requests.post(f"{api_url}/objects/radar-point", json=payload)
+            response = transport.post_json(f"{api_url}/objects/radar-point", payload)
             print(response)
             print(f"Sent radar point {i+1}/4: lat={pos['lat']:.4f}, lon={pos['lon']:.4f}, alt={pos['alt']}")
             
@@ -419,14 +511,32 @@ def send_radar_points_with_timing(api_url):
     return positions
 
 
-def create_drone_track_simulation(offset_seconds=14):
+def create_drone_track_simulation(offset_seconds=14, seed=None, base_time=None):
     """
     Create a moving unknown object that will be tracked and later classified as a drone
     This appears 1 second after the last radar point (T+14s)
     
     Args:
         offset_seconds: Seconds to offset the timestamps (14s = after radar attack at T+10,11,12,13s)
+        seed: Seed for the track; seeded tracks are cached (see scenario_cache) and reused
+        base_time: Naive UTC time the offset is counted from (default: now)
     """
+    import scenario_cache
+
+    if base_time is None:
+        base_time = datetime.datetime.utcnow()
+    offset_time = base_time + datetime.timedelta(seconds=offset_seconds)
+
+    # The track only depends on the seed and the radars, so every offset and start time
+    # reuses one cache entry
+    return scenario_cache.cached_track("drone_track", {"radars": radar_cache_params()}, seed, offset_time,
+                                       lambda start_time: _build_drone_track(start_time, seed))
+
+
+def _build_drone_track(offset_time, seed):
+    """Build the drone track of create_drone_track_simulation, starting at offset_time"""
+    rng = random.Random(seed)
+
     # Start from the last radar point position and move towards Israel
     start_position = {"lat": 33.236677, "lon": 35.430565}
     # start_position = {"lat":33.172175, "lon": 35.427475}
@@ -442,31 +552,25 @@ def create_drone_track_simulation(offset_seconds=14):
         "arrow",
         "#40E0D0",
         "normal",
-        "ב149"  # Name: Suspicious drone
+        "ב149",  # Name: Suspicious drone
+        seed=rng.getrandbits(64) if seed is not None else None,
+        base_time=offset_time  # drone appears at T+offset_seconds (1s after last radar point)
     )
     
-    # Offset all timestamps by 14 seconds so drone appears at T+14s (1s after last radar point)
-    base_time = datetime.datetime.utcnow()
-    offset_time = base_time + datetime.timedelta(seconds=offset_seconds)
-    
-    # Update all point timestamps
-    for point in flight_data["points"]:
-        original_time = datetime.datetime.fromisoformat(point["timestamp"].replace("+00:00", ""))
-        time_diff = original_time - base_time
-        new_time = offset_time + time_diff
-        point["timestamp"] = new_time.isoformat() + "+00:00"
-    
     # Generate radar detections for the drone track and merge with original points
     print(f"\nGenerating radar detections for drone track...")
     all_points_with_radar = []
     total_radar_detections = 0
+    track_points = flight_data["points"]
+    coverage = RADAR_INDEX.detect_many([p["lat"] for p in track_points], [p["lon"] for p in track_points])
     
-    for point in flight_data["points"]:
+    for point, detecting_radars in zip(track_points, coverage):
         # Add original point
         all_points_with_radar.append(point)
         
         # Add radar detection points
-        detections = generate_radar_detections(point, point["point_id"])
+        detections = generate_radar_detections(point, point["point_id"], rng=rng,
+                                               detecting_radars=detecting_radars)
         all_points_with_radar.extend(detections)
         total_radar_detections += len(detections)
     
@@ -570,81 +674,10 @@ def create_drone_track_simulation(offset_seconds=14):
 
 # Example usage
 if __name__ == "__main__":
+    # Track specs and parallel generation live in generate_scenario.py
+    from generate_scenario import default_track_specs, generate_tracks
 
-    start_point = {"lat": 31.1444067, "lon": 35.1205757}
-    end_point = {"lat": 31.1464498, "lon": 35.0939402}
-    birds_start_points = [
-        {"lat": 33.865895211796346, "lon": 35.84838867187501},
-        {"lat": 33.92885480180959, "lon": 35.74951171875001},
-        {"lat": 33.01273389791075, "lon": 35.62866210937501},
-        {"lat": 33.282488692700504, "lon": 35.73852539062501},
-        {"lat": 33.10584293285769, "lon": 36.07360839843751},
-        {"lat": 33.89621446335144, "lon": 36.24938964843751},
-        {"lat": 33.008075959291055, "lon": 35.96923828125001},
-        {"lat": 33.175612478499346, "lon": 35.86486816406251},
-        {"lat": 33.519026027827515, "lon": 36.08459472656251},
-        {"lat": 33.579220642875676, "lon": 36.50756835937501},
-        {"lat": 33.43561304116276, "lon": 36.96350097656251},
-        {"lat": 33.34284135639302, "lon": 36.66687011718751},
-        {"lat": 33.040676557717454, "lon": 36.57897949218751},
-        {"lat": 33.175612478499346, "lon": 36.12854003906251},
-        {"lat": 33.38460040620993, "lon": 36.00769042968751},
-        {"lat": 33.26855544621476, "lon": 36.33178710937501},
-        {"lat": 33.4031537914036, "lon": 36.18347167968751},
-        {"lat": 33.713355353177555, "lon": 36.30981445312501},
-        {"lat": 33.8334428466495, "lon": 36.82067871093751},
-        {"lat": 33.708733368521614, "lon": 37.00744628906251},
-        {"lat": 33.602361666817515, "lon": 36.76025390625001},
-        {"lat": 33.217448573031035, "lon": 36.87561035156251},
-        {"lat": 33.863562548378965, "lon": 36.62292480468751},
-        {"lat": 33.810361684869015, "lon": 36.39221191406251},
-        {"lat": 33.063924198120645, "lon": 36.89208984375001}]
-    birds_end_point = {"lat": 31.1464498, "lon": 35.0939402}
-    data = {"bird": [], "plane": [], "jet": []}
-    for bird_start_point in birds_start_points:
-        data["bird"].append(simulate_aircraft(bird_start_point, birds_end_point, 30, 70, 1000, 6000, "bird", "orange"))
-
-    planes_points: list[tuple] = [
-        ({"lat": 32.35676318267811, "lon": 33.72802734375001}, {"lat": 31.961483557268558, "lon": 34.45312500000001}, {"speed":350, "alt":280000, "name":"ELY358"}),
-        ({"lat": 33.78371305547283, "lon": 34.65637207031251}, {"lat": 34.043556504127444, "lon": 34.10705566406251}, {"speed":400, "alt":370000, "name":"TKJ318"}),
-        ({"lat": 32.0383483283312, "lon": 33.64013671875001}, {"lat": 31.742182762117984, "lon": 34.15649414062501}, {"speed":350, "alt":380000, "name":"ACA56"}),
-        ({"lat": 33.906895551288684, "lon": 35.61767578125001}, {"lat": 33.73804486328907, "lon": 35.28808593750001}, {"speed":250, "alt":80000, "name":"DST445"}),
-        ({"lat": 33.63291573870479, "lon": 35.29083251953126}, {"lat": 33.46810795527896, "lon": 35.13153076171876}, {"speed":250, "alt":60000, "name":"KGK456"}),
-        ({"lat": 33.9388027508458, "lon": 34.71130371093751}, {"lat": 33.95247360616284, "lon": 35.11779785156251}, {"speed":300, "alt":100000, "name":"DHX160"}),
-        ({"lat": 32.32891738775126, "lon": 34.51354980468751}, {"lat": 32.537551746769, "lon": 33.86535644531251}, {"speed":350, "alt":280000, "name":"ELY337"}),
-        ({"lat": 33.957030069982316, "lon": 36.40869140625001}, {"lat": 33.84760762988741, "lon": 36.55151367187501}, {"speed":400, "alt":370000, "name":"RED165"}),
-        ({"lat": 33.678639851675555, "lon": 36.79870605468751}, {"lat": 33.6008944080788, "lon": 36.85913085937501}, {"speed":400, "alt":370000, "name":"YEL897"})
-    ]
-
-    for start_point_plane, end_point_plane, plane_data in planes_points:
-        data["plane"].append(
-            simulate_aircraft(start_point_plane, end_point_plane, plane_data["speed"] - 5, plane_data["speed"] + 5, plane_data["alt"] - 300, plane_data["alt"] + 300, "plane", "white", "normal", plane_data["name"]))
-
-    jet_chill_points: list[tuple] = [
-        ({"lat": 32.784965481461185, "lon": 35.40206909179688}, {"lat": 32.81844077366436, "lon": 33.31005859375001}, {"speed":350, "alt":150000, "name":"ציוני1"}),
-        ({"lat": 32.765336175015776, "lon": 35.37048339843751}, {"lat": 32.79651010951669, "lon": 33.26748657226563},{"speed":350, "alt":140000, "name":"ציוני2"}),
-        ({"lat": 32.87036022808352, "lon": 34.56298828125001}, {"lat": 31.100745405144245, "lon": 34.59045410156251},{"speed":400, "alt":210000, "name":"ברדלס1"}),
-        ({"lat": 32.91187391621322, "lon": 34.35974121093751}, {"lat": 31.215712251730736, "lon": 34.34326171875001},{"speed":400, "alt":180000, "name":"ברדלס2"}),
-        ({"lat": 32.27900558170509, "lon": 35.49682617187501}, {"lat": 35.362563311220384, "lon": 35.50781250000001},{"speed":450, "alt":300000, "name":"אס1"}),
-        ({"lat": 32.299902241069326, "lon": 35.45562744140626},{"lat": 35.400834826722196, "lon": 35.46936035156251},{"speed":450, "alt":300000, "name":"אס2"})
-    ]
-    i = 0
-    for start_point_jet_chill, end_point_jet_chill, jet_data in jet_chill_points:
-        i += 1
-        if i < 2:
-            data["jet"].append(
-                simulate_aircraft(start_point_jet_chill, end_point_jet_chill, jet_data["speed"] - 5, jet_data["speed"] + 5, jet_data["alt"] - 300, jet_data["alt"] + 300, "jet", "yellow",
-                                  "chill", jet_data["name"]))
-        else:
-            data["jet"].append(
-                simulate_aircraft(start_point_jet_chill, end_point_jet_chill, jet_data["speed"] - 5, jet_data["speed"] + 5, jet_data["alt"] - 300, jet_data["alt"] + 300, "jet", "yellow",
-                                  "aggressive", jet_data["name"]))
-
-
-    all = data["bird"]
-    all.extend(data["jet"])
-    all.extend(data["plane"])
-    
+    all = generate_tracks(default_track_specs(), workers=1, verbose=True)
 
     with open("../simulated_flights7.json", 'w') as www:
         json.dump(all, www)
@@ -652,9 +685,8 @@ if __name__ == "__main__":
     print("\n" + "="*60)
     print("Simulation data prepared and saved!")
     print("="*60)
-    for course_type in data:
-        for course in data[course_type]:
-            points = course.pop("points")
-            create_course(course, points)
+    for course in all:
+        points = course.pop("points")
+        create_course(course, points)
 
-    print(json.dumps(data, indent=2))
+    print(json.dumps(all, indent=2))
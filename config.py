@@ -15,16 +15,45 @@ DOCUMENT_ID = 'X3Rg6eFxI6aS7lDARwxh'  # Optional: specific document ID
 # API settings - loaded from environment variables
 API_BASE_URL = os.getenv('API_BASE_URL', 'http://localhost:3001')
 OBJECTS_ENDPOINT = os.getenv('OBJECTS_ENDPOINT', '/objects/temporary')
+BATCH_ENDPOINT = os.getenv('BATCH_ENDPOINT', '/objects/temporary/batch')
 
 # Simulation settings
+SCENARIO_PATH = os.getenv('SCENARIO_PATH', 'simulated_flights7.json')  # JSON or compiled .simbin scenario (see scenario.py)
 TICK_INTERVAL = int(os.getenv('TICK_INTERVAL', '1'))  # seconds between checks
 INACTIVITY_TIMEOUT = int(os.getenv('INACTIVITY_TIMEOUT', '10'))  # seconds of inactivity before marking as deleted
+TIME_SCALE = float(os.getenv('TIME_SCALE', '1'))  # replay speed: 1 = real time, 10 = 10x faster, 0 = as fast as possible
+
+# Generated scenarios
+SCENARIO_SEED = int(os.getenv('SCENARIO_SEED')) if os.getenv('SCENARIO_SEED') else None  # default seed for generated tracks (unset = random)
+SCENARIO_CACHE_DIR = os.getenv('SCENARIO_CACHE_DIR', '.scenario_cache')  # cache of seeded generated tracks ('' = memory only)
+
+# HTTP transport settings
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '50'))  # pooled connections per host
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))  # seconds before a request is abandoned
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))  # retries on connection failures and 502/503
+HTTP_BACKOFF = float(os.getenv('HTTP_BACKOFF', '0.3'))  # exponential backoff factor between retries
+HTTP_KEEP_ALIVE = os.getenv('HTTP_KEEP_ALIVE', 'true').lower() == 'true'  # reuse connections between requests
+
+# JSON encoder for outbound payloads: 'auto' (orjson, then stdlib) or one of them by name
+JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto')
+
+# Maximum object updates sent in parallel within one tick (1 = sequential)
+MAX_CONCURRENT_SENDS = int(os.getenv('MAX_CONCURRENT_SENDS', '8'))
+
+# Update settings
+UPDATE_MODE = os.getenv('UPDATE_MODE', 'full')  # 'full' resends every plot, 'delta' sends only new plots
+KEYFRAME_INTERVAL = int(os.getenv('KEYFRAME_INTERVAL', '0'))  # delta mode: full snapshot every N updates (0 = first only)
+SEND_MODE = os.getenv('SEND_MODE', 'per_object')  # 'per_object' posts each object, 'batch' posts one body per tick
 
 # Print loaded configuration on import (helpful for debugging)
 if __name__ != "__main__":
     print(f"📡 API Configuration loaded:")
     print(f"   API_BASE_URL: {API_BASE_URL}")
     print(f"   OBJECTS_ENDPOINT: {OBJECTS_ENDPOINT}")
+    print(f"   SCENARIO_PATH: {SCENARIO_PATH}")
     print(f"   TICK_INTERVAL: {TICK_INTERVAL}s")
     print(f"   INACTIVITY_TIMEOUT: {INACTIVITY_TIMEOUT}s")
+    print(f"   TIME_SCALE: {TIME_SCALE}")
+    print(f"   UPDATE_MODE: {UPDATE_MODE}")
+    print(f"   SEND_MODE: {SEND_MODE}")
 
@@ -0,0 +1,285 @@
+"""
+Tick loop that replays an ObjectSimulator in real time
+"""
+import math
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+import config
+
+# Longest uninterrupted sleep between ticks: a stop signal is noticed at least this often
+WAKE_INTERVAL = 0.5
+
+
+class SimulationEngine:
+    """
+    Drives an ObjectSimulator tick by tick
+
+    The main replay and the drone/rocket attacks all run through this one loop,
+    so scheduling and sending improvements apply to every scenario.
+    """
+
+    def __init__(self, simulator,
+                 should_continue: Optional[Callable[[], bool]] = None,
+                 on_tick: Optional[Callable[["SimulationEngine"], None]] = None,
+                 sender: Optional[Callable[[Iterable[str], Iterable[str]], None]] = None,
+                 tick_interval: Optional[float] = None,
+                 time_scale: Optional[float] = None):
+        """
+        Args:
+            simulator: The ObjectSimulator to drive
+            should_continue: Checked before every tick, the run stops once it returns False
+            on_tick: Called with the engine after every tick
+            sender: Called with (updated_ids, deleted_ids) to deliver a tick's changes,
+                defaults to the simulator's configured send mode
+            tick_interval: Simulated seconds per tick, defaults to config.TICK_INTERVAL
+            time_scale: Simulated seconds per wall-clock second (10 = ten times faster than
+                real time), 0 replays as fast as possible; defaults to config.TIME_SCALE
+        """
+        self.simulator = simulator
+        self.should_continue = should_continue or (lambda: True)
+        self.on_tick = on_tick
+        self.sender = sender or simulator._send_tick_updates
+        self.tick_interval = tick_interval if tick_interval is not None else config.TICK_INTERVAL
+        self.time_scale = time_scale if time_scale is not None else config.TIME_SCALE
+        if not math.isfinite(self.time_scale) or self.time_scale < 0:
+            raise ValueError(f"time_scale must be a finite number >= 0, got {self.time_scale}")
+
+        # Per-run timing metrics, see _wait_for_next_tick
+        self.metrics = {
+            "ticks": 0,
+            "overruns": 0,
+            "skipped_ticks": 0,
+            "max_overrun": 0.0,
+            "total_overrun": 0.0,
+            "last_tick_duration": 0.0
+        }
+
+        # Wall-clock anchor: the simulation time that corresponds to a monotonic clock reading
+        self._anchor_wall = None
+        self._anchor_sim = 0.0
+
+        # Seek requested from another thread, applied between ticks
+        self._pending_seek = None
+
+        # Cleared while paused; the loop blocks on it between ticks
+        self._running = threading.Event()
+        self._running.set()
+
+        # Set by pause(), request_seek() and wake() to cut the wait for the next tick short
+        self._wake = threading.Event()
+
+    def run_tick(self):
+        """Process everything due at the current simulation time, then advance it by one tick"""
+        simulator = self.simulator
+
+        updated_ids = simulator._apply_due_points()
+        deleted_ids = simulator._take_inactive_objects()
+
+        # Send one update per object after all points for this tick are added, plus deletions
+        self.sender(updated_ids, deleted_ids)
+
+        if self.on_tick:
+            self.on_tick(self)
+
+        simulator.current_simulation_time += self.tick_interval
+
+    @property
+    def paused(self) -> bool:
+        """Whether the replay is currently paused"""
+        return not self._running.is_set()
+
+    def pause(self):
+        """Pause the replay after the current tick, keeping all simulator state in memory"""
+        self._running.clear()
+        self._wake.set()
+
+    def resume(self):
+        """Continue a paused replay from where it stopped"""
+        self._running.set()
+
+    def wake(self):
+        """Interrupt the wait for the next tick, e.g. right after should_continue turned False"""
+        self._wake.set()
+
+    def _wait_while_paused(self):
+        """
+        Block while paused, still honouring the stop signal and applying seeks right
+        away (so the receiver shows the new position while paused), then re-anchor the clock
+        """
+        if not self.paused:
+            return
+
+        print(f"[T+{self.simulator.current_simulation_time:.1f}s] ⏸️  Simulation paused")
+        while not self._running.wait(timeout=WAKE_INTERVAL):
+            if not self.should_continue():
+                return
+            self._apply_pending_seek()
+
+        print(f"[T+{self.simulator.current_simulation_time:.1f}s] ▶️  Simulation resumed")
+        # Time spent paused must not count as an overrun
+        self._anchor_clock()
+
+    def request_seek(self, offset: float):
+        """
+        Ask the running engine to jump to a simulation time before its next tick
+        (within WAKE_INTERVAL while paused)
+        
+        Args:
+            offset: Simulation time to jump to, in seconds from ground zero
+        """
+        if not math.isfinite(offset):
+            raise ValueError(f"seek offset must be a finite number, got {offset}")
+        self._pending_seek = offset
+        self._wake.set()
+
+    def _apply_pending_seek(self):
+        """Apply the seek requested by request_seek, if any"""
+        if self._pending_seek is not None:
+            offset, self._pending_seek = self._pending_seek, None
+            self._apply_seek(offset)
+
+    def _apply_seek(self, offset: float):
+        """
+        Jump the simulator to an offset and bring the receiver in sync with it
+        
+        Args:
+            offset: Simulation time to jump to, in seconds from ground zero
+        """
+        active_ids, gone_ids = self.simulator.seek(offset)
+        self.sender(sorted(active_ids), gone_ids)
+        self._anchor_clock()
+
+    def _anchor_clock(self):
+        """Align the current simulation time with the current monotonic time"""
+        self._anchor_wall = time.monotonic()
+        self._anchor_sim = self.simulator.current_simulation_time
+
+    @property
+    def unthrottled(self) -> bool:
+        """Whether ticks run back to back without waiting for the clock"""
+        return self.time_scale == 0
+
+    def _deadline_for(self, simulation_time: float) -> float:
+        """Monotonic time at which the tick for a simulation time should start"""
+        return self._anchor_wall + (simulation_time - self._anchor_sim) / self.time_scale
+
+    def _sleep_until(self, deadline: float):
+        """
+        Sleep until a monotonic deadline, returning early when the replay is stopped,
+        paused or asked to seek
+        
+        Slow replays (time_scale < 1) wait longer than a tick interval between ticks, so
+        the wait is split into WAKE_INTERVAL slices that re-check the stop signal, and
+        pause()/request_seek()/wake() end it at once.
+        """
+        self._wake.clear()
+        while not self.paused and self._pending_seek is None and self.should_continue():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._wake.wait(min(remaining, WAKE_INTERVAL))
+            self._wake.clear()
+
+    def _wait_for_next_tick(self, total_duration: float):
+        """
+        Sleep until the next tick's absolute deadline, or skip ticks after an overrun
+        
+        Deadlines are derived from a fixed anchor rather than from the previous tick,
+        so late ticks never accumulate into drift. When a tick finishes after the next
+        deadline, the ticks whose deadlines already passed are skipped: the simulation
+        time jumps to where the wall clock is, and the next tick processes every point
+        that became due in between.
+        
+        Args:
+            total_duration: Simulation time of the last point (never skipped past)
+        """
+        if self.unthrottled:
+            return
+
+        simulator = self.simulator
+        now = time.monotonic()
+        lag = now - self._deadline_for(simulator.current_simulation_time)
+
+        if lag <= 0:
+            self._sleep_until(now - lag)
+            return
+
+        self.metrics["overruns"] += 1
+        self.metrics["total_overrun"] += lag
+        self.metrics["max_overrun"] = max(self.metrics["max_overrun"], lag)
+
+        missed = int(lag // (self.tick_interval / self.time_scale))
+        remaining = int((total_duration - simulator.current_simulation_time) // self.tick_interval)
+        missed = min(missed, max(remaining, 0))
+        if missed > 0:
+            simulator.current_simulation_time += missed * self.tick_interval
+            self.metrics["skipped_ticks"] += missed
+
+        print(f"[T+{simulator.current_simulation_time:.1f}s] ⚠️  Tick overran by {lag:.2f}s, "
+              f"skipped {missed} tick(s) to catch up")
+
+    def run(self, start_offset: Optional[float] = None) -> bool:
+        """
+        Prepare the simulator and replay it until it finishes or is stopped
+        
+        Args:
+            start_offset: Simulation time to start from instead of ground zero
+        
+        Returns:
+            True if the whole scenario was replayed, False if it was stopped or empty
+        """
+        simulator = self.simulator
+        if not simulator.prepare_simulation():
+            return False
+
+        print("\n" + "=" * 60)
+        if self.unthrottled:
+            print("Starting simulation (unthrottled, as fast as possible)...")
+        elif self.time_scale != 1:
+            print(f"Starting simulation ({self.time_scale:g}x real time)...")
+        else:
+            print("Starting simulation...")
+        print("=" * 60 + "\n")
+
+        real_start_time = time.monotonic()
+        total_duration = simulator._get_total_duration()
+        if start_offset:
+            self._pending_seek = start_offset
+        self._anchor_clock()
+
+        try:
+            while simulator.current_simulation_time <= total_duration and self.should_continue():
+                self._wait_while_paused()
+                if not self.should_continue():
+                    break
+
+                self._apply_pending_seek()
+
+                tick_start = time.monotonic()
+
+                self.run_tick()
+
+                self.metrics["ticks"] += 1
+                self.metrics["last_tick_duration"] = time.monotonic() - tick_start
+
+                # Stay aligned with wall-clock time
+                self._wait_for_next_tick(total_duration)
+        finally:
+            simulator.close()
+
+        completed = simulator.current_simulation_time > total_duration
+
+        # Final summary
+        print("\n" + "=" * 60)
+        print("Simulation complete!" if completed else "Simulation stopped by user!")
+        print("=" * 60)
+        print(f"Total simulation time: {total_duration:.1f} seconds")
+        print(f"Total real time: {time.monotonic() - real_start_time:.1f} seconds")
+        print(f"Total points processed: {simulator.next_point_index}")
+        print(f"Objects marked as deleted: {len(simulator.objects_marked_deleted)}")
+        print(f"Ticks: {self.metrics['ticks']} run, {self.metrics['skipped_ticks']} skipped, "
+              f"{self.metrics['overruns']} overran (max {self.metrics['max_overrun']:.2f}s)")
+
+        return completed
@@ -0,0 +1,234 @@
+"""
+Scenario generation: build a scenario file of synthetic tracks in parallel
+
+Every track is generated by all.simulate_aircraft in a worker process, seeded with its
+own seed derived from the scenario seed and the track's index, so a scenario can be
+regenerated exactly regardless of the number of workers. Tracks of a seeded run (--seed or
+SCENARIO_SEED) are cached by (spec, radars, seed) in config.SCENARIO_CACHE_DIR, so
+regenerating a scenario with the same seed only shifts the cached tracks to the new base time.
+
+Usage:
+    python generate_scenario.py --seed 7 --output generated_scenario.json
+    python generate_scenario.py --seed 7 --base-time 2025-01-01T12:00:00 --no-cache
+    python generate_scenario.py --specs tracks.json --workers 16 --output big.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import all as generator
+import config
+import scenario_cache
+
+# Routes of the default scenario: 25 birds, 6 fighter jets (the first one flying
+# steadily, the rest aggressively) and 9 airliners
+
+BIRD_START_POINTS = [
+    {"lat": 33.865895211796346, "lon": 35.84838867187501},
+    {"lat": 33.92885480180959, "lon": 35.74951171875001},
+    {"lat": 33.01273389791075, "lon": 35.62866210937501},
+    {"lat": 33.282488692700504, "lon": 35.73852539062501},
+    {"lat": 33.10584293285769, "lon": 36.07360839843751},
+    {"lat": 33.89621446335144, "lon": 36.24938964843751},
+    {"lat": 33.008075959291055, "lon": 35.96923828125001},
+    {"lat": 33.175612478499346, "lon": 35.86486816406251},
+    {"lat": 33.519026027827515, "lon": 36.08459472656251},
+    {"lat": 33.579220642875676, "lon": 36.50756835937501},
+    {"lat": 33.43561304116276, "lon": 36.96350097656251},
+    {"lat": 33.34284135639302, "lon": 36.66687011718751},
+    {"lat": 33.040676557717454, "lon": 36.57897949218751},
+    {"lat": 33.175612478499346, "lon": 36.12854003906251},
+    {"lat": 33.38460040620993, "lon": 36.00769042968751},
+    {"lat": 33.26855544621476, "lon": 36.33178710937501},
+    {"lat": 33.4031537914036, "lon": 36.18347167968751},
+    {"lat": 33.713355353177555, "lon": 36.30981445312501},
+    {"lat": 33.8334428466495, "lon": 36.82067871093751},
+    {"lat": 33.708733368521614, "lon": 37.00744628906251},
+    {"lat": 33.602361666817515, "lon": 36.76025390625001},
+    {"lat": 33.217448573031035, "lon": 36.87561035156251},
+    {"lat": 33.863562548378965, "lon": 36.62292480468751},
+    {"lat": 33.810361684869015, "lon": 36.39221191406251},
+    {"lat": 33.063924198120645, "lon": 36.89208984375001}]
+
+BIRD_END_POINT = {"lat": 31.1464498, "lon": 35.0939402}
+
+PLANE_ROUTES = [
+    ({"lat": 32.35676318267811, "lon": 33.72802734375001}, {"lat": 31.961483557268558, "lon": 34.45312500000001}, {"speed":350, "alt":280000, "name":"ELY358"}),
+    ({"lat": 33.78371305547283, "lon": 34.65637207031251}, {"lat": 34.043556504127444, "lon": 34.10705566406251}, {"speed":400, "alt":370000, "name":"TKJ318"}),
+    ({"lat": 32.0383483283312, "lon": 33.64013671875001}, {"lat": 31.742182762117984, "lon": 34.15649414062501}, {"speed":350, "alt":380000, "name":"ACA56"}),
+    ({"lat": 33.906895551288684, "lon": 35.61767578125001}, {"lat": 33.73804486328907, "lon": 35.28808593750001}, {"speed":250, "alt":80000, "name":"DST445"}),
+    ({"lat": 33.63291573870479, "lon": 35.29083251953126}, {"lat": 33.46810795527896, "lon": 35.13153076171876}, {"speed":250, "alt":60000, "name":"KGK456"}),
+    ({"lat": 33.9388027508458, "lon": 34.71130371093751}, {"lat": 33.95247360616284, "lon": 35.11779785156251}, {"speed":300, "alt":100000, "name":"DHX160"}),
+    ({"lat": 32.32891738775126, "lon": 34.51354980468751}, {"lat": 32.537551746769, "lon": 33.86535644531251}, {"speed":350, "alt":280000, "name":"ELY337"}),
+    ({"lat": 33.957030069982316, "lon": 36.40869140625001}, {"lat": 33.84760762988741, "lon": 36.55151367187501}, {"speed":400, "alt":370000, "name":"RED165"}),
+    ({"lat": 33.678639851675555, "lon": 36.79870605468751}, {"lat": 33.6008944080788, "lon": 36.85913085937501}, {"speed":400, "alt":370000, "name":"YEL897"})
+]
+
+JET_ROUTES = [
+    ({"lat": 32.784965481461185, "lon": 35.40206909179688}, {"lat": 32.81844077366436, "lon": 33.31005859375001}, {"speed":350, "alt":150000, "name":"ציוני1"}),
+    ({"lat": 32.765336175015776, "lon": 35.37048339843751}, {"lat": 32.79651010951669, "lon": 33.26748657226563},{"speed":350, "alt":140000, "name":"ציוני2"}),
+    ({"lat": 32.87036022808352, "lon": 34.56298828125001}, {"lat": 31.100745405144245, "lon": 34.59045410156251},{"speed":400, "alt":210000, "name":"ברדלס1"}),
+    ({"lat": 32.91187391621322, "lon": 34.35974121093751}, {"lat": 31.215712251730736, "lon": 34.34326171875001},{"speed":400, "alt":180000, "name":"ברדלס2"}),
+    ({"lat": 32.27900558170509, "lon": 35.49682617187501}, {"lat": 35.362563311220384, "lon": 35.50781250000001},{"speed":450, "alt":300000, "name":"אס1"}),
+    ({"lat": 32.299902241069326, "lon": 35.45562744140626},{"lat": 35.400834826722196, "lon": 35.46936035156251},{"speed":450, "alt":300000, "name":"אס2"})
+]
+
+
+def default_track_specs() -> List[Dict[str, Any]]:
+    """
+    Build the track specs of the default scenario, in scenario order (birds, jets, planes)
+
+    Each spec holds the keyword arguments of all.simulate_aircraft.
+
+    Returns:
+        List of track spec dicts
+    """
+    specs = []
+    for start in BIRD_START_POINTS:
+        specs.append({
+            "start": start, "end": BIRD_END_POINT,
+            "min_speed_kts": 30, "max_speed_kts": 70, "min_alt_ft": 1000, "max_alt_ft": 6000,
+            "object_type": "bird", "color": "orange"
+        })
+    for index, (start, end, jet) in enumerate(JET_ROUTES):
+        specs.append({
+            "start": start, "end": end,
+            "min_speed_kts": jet["speed"] - 5, "max_speed_kts": jet["speed"] + 5,
+            "min_alt_ft": jet["alt"] - 300, "max_alt_ft": jet["alt"] + 300,
+            "object_type": "jet", "color": "yellow",
+            "behavior": "chill" if index == 0 else "aggressive", "name": jet["name"]
+        })
+    for start, end, plane in PLANE_ROUTES:
+        specs.append({
+            "start": start, "end": end,
+            "min_speed_kts": plane["speed"] - 5, "max_speed_kts": plane["speed"] + 5,
+            "min_alt_ft": plane["alt"] - 300, "max_alt_ft": plane["alt"] + 300,
+            "object_type": "plane", "color": "white", "behavior": "normal", "name": plane["name"]
+        })
+    return specs
+
+
+def track_seed(scenario_seed: int, index: int) -> int:
+    """
+    Derive the seed of one track from the scenario seed
+
+    Args:
+        scenario_seed: Seed of the whole scenario
+        index: Position of the track in the scenario
+
+    Returns:
+        64-bit seed, the same in every process and on every run
+    """
+    return random.Random(f"{scenario_seed}:{index}").getrandbits(64)
+
+
+def generate_track(spec: Dict[str, Any], seed: int, base_time: datetime, verbose: bool = False,
+                   use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Generate one track from its spec with a fixed seed
+
+    Args:
+        spec: Keyword arguments for all.simulate_aircraft
+        seed: Seed for the track's random choices and its ID
+        base_time: Naive UTC time of the track's first point
+        verbose: Keep simulate_aircraft's per-point log output
+        use_cache: Reuse (and store) the track in the scenario cache
+
+    Returns:
+        Course dict with its points
+    """
+    def simulate(start_time):
+        return generator.simulate_aircraft(**spec, seed=seed, base_time=start_time)
+
+    with contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO()):
+        if not use_cache:
+            return simulate(base_time)
+        params = {"spec": spec, "radars": generator.radar_cache_params()}
+        return scenario_cache.cached_track("simulate_aircraft", params, seed, base_time, simulate)
+
+
+def _generate_track_job(job):
+    """Process pool entry point: unpack (spec, seed, base_time, verbose, use_cache) for generate_track"""
+    return generate_track(*job)
+
+
+def generate_tracks(specs: List[Dict[str, Any]], seed: Optional[int] = None, workers: Optional[int] = None,
+                    verbose: bool = False, base_time: Optional[datetime] = None,
+                    use_cache: bool = True) -> List[Dict[str, Any]]:
+    """
+    Generate every track of a scenario, in parallel when workers > 1
+
+    Args:
+        specs: Track specs (see default_track_specs)
+        seed: Scenario seed; defaults to config.SCENARIO_SEED, else a random one is picked (and printed)
+        workers: Worker processes, defaults to the CPU count (1 generates in this process)
+        verbose: Keep simulate_aircraft's per-point log output
+        base_time: Naive UTC time every track starts at (default: now)
+        use_cache: Reuse (and store) tracks in the scenario cache; only applies to seeded
+            runs, a randomly picked seed is never seen again so its tracks are not cached
+
+    Returns:
+        Courses in spec order
+    """
+    if seed is None:
+        seed = config.SCENARIO_SEED
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+        use_cache = False
+        print(f"🎲 Scenario seed: {seed}")
+    if base_time is None:
+        base_time = datetime.utcnow()
+    workers = workers or os.cpu_count() or 1
+    jobs = [(spec, track_seed(seed, index), base_time, verbose, use_cache) for index, spec in enumerate(specs)]
+
+    if workers <= 1 or len(jobs) <= 1:
+        return [_generate_track_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        return list(executor.map(_generate_track_job, jobs, chunksize=chunksize))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a scenario file of synthetic tracks")
+    parser.add_argument("--output", "-o", default="generated_scenario.json",
+                        help="Scenario file to write (point SCENARIO_PATH at it to replay it)")
+    parser.add_argument("--specs", help="JSON file with a list of track specs (default: the built-in scenario)")
+    parser.add_argument("--seed", type=int, help="Scenario seed (default: SCENARIO_SEED, else random and printed)")
+    parser.add_argument("--base-time", help="ISO 8601 start time of every track (default: now, UTC)")
+    parser.add_argument("--no-cache", action="store_true", help="Regenerate every track instead of reusing cached ones")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--verbose", action="store_true", help="Print every generated point")
+    args = parser.parse_args()
+
+    if args.specs:
+        with open(args.specs, "r", encoding="utf-8") as f:
+            specs = json.load(f)
+    else:
+        specs = default_track_specs()
+
+    base_time = None
+    if args.base_time:
+        base_time = datetime.fromisoformat(args.base_time.replace("Z", "+00:00"))
+        if base_time.tzinfo is not None:
+            base_time = base_time.astimezone(timezone.utc).replace(tzinfo=None)
+
+    start = time.perf_counter()
+    courses = generate_tracks(specs, seed=args.seed, workers=args.workers, verbose=args.verbose,
+                              base_time=base_time, use_cache=not args.no_cache)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(courses, f)
+
+    points = sum(len(course["points"]) for course in courses)
+    print(f"✅ Generated {len(courses)} tracks, {points} points in {time.perf_counter() - start:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Great-circle geometry shared by the track generators, radar detection and the simulator
+
+Scalar functions use the math module and are the fast path for single points. The
+*_array variants take NumPy arrays (or scalars, broadcast against them) and compute
+whole tracks at once; they need NumPy, see HAS_NUMPY.
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+EARTH_RADIUS = 6371000  # meters
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Calculate the great-circle distance between two points
+
+    Args:
+        lat1: Latitude of the first point
+        lon1: Longitude of the first point
+        lat2: Latitude of the second point
+        lon2: Longitude of the second point
+
+    Returns:
+        Distance in meters
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return EARTH_RADIUS * c
+
+
+def bearing(lat1, lon1, lat2, lon2):
+    """
+    Calculate the initial bearing from point 1 to point 2
+
+    Args:
+        lat1: Latitude of the first point
+        lon1: Longitude of the first point
+        lat2: Latitude of the second point
+        lon2: Longitude of the second point
+
+    Returns:
+        Bearing in degrees (0-360), where 0 is North, 90 is East, 180 is South, 270 is West
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    delta_lambda = math.radians(lon2 - lon1)
+    y = math.sin(delta_lambda) * math.cos(phi2)
+    x = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(delta_lambda)
+    return (math.degrees(math.atan2(y, x)) + 360) % 360
+
+
+def move_point(lat, lon, speed, brg, dt=1):
+    """
+    Move a point along a bearing for dt seconds at the given speed
+
+    Args:
+        lat: Latitude of the point
+        lon: Longitude of the point
+        speed: Speed in meters per second (or a distance in meters with dt=1)
+        brg: Bearing in degrees
+        dt: Seconds of travel
+
+    Returns:
+        Tuple of (lat, lon) of the destination
+    """
+    distance = speed * dt
+    brg = math.radians(brg)
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2 = math.asin(math.sin(lat1) * math.cos(distance / EARTH_RADIUS) +
+                     math.cos(lat1) * math.sin(distance / EARTH_RADIUS) * math.cos(brg))
+    lon2 = lon1 + math.atan2(math.sin(brg) * math.sin(distance / EARTH_RADIUS) * math.cos(lat1),
+                             math.cos(distance / EARTH_RADIUS) - math.sin(lat1) * math.sin(lat2))
+    return math.degrees(lat2), math.degrees(lon2)
+
+
+def haversine_array(lat1, lon1, lat2, lon2):
+    """
+    Vectorized haversine: element-wise distances in meters for arrays of points
+
+    Arguments may be arrays or scalars and are broadcast against each other.
+    """
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = np.radians(lon2) - np.radians(lon1)
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2) ** 2
+    return EARTH_RADIUS * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def bearing_array(lat1, lon1, lat2, lon2):
+    """
+    Vectorized bearing: element-wise initial bearings in degrees (0-360)
+
+    Arguments may be arrays or scalars and are broadcast against each other.
+    """
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    delta_lambda = np.radians(lon2) - np.radians(lon1)
+    y = np.sin(delta_lambda) * np.cos(phi2)
+    x = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(delta_lambda)
+    return (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+
+def move_point_array(lat, lon, distance, brg):
+    """
+    Vectorized move_point: destinations for arrays of start points, distances and bearings
+
+    Arguments may be arrays or scalars and are broadcast against each other, e.g. one
+    start point and bearing with an array of distances gives points along a great circle.
+
+    Args:
+        lat: Latitudes in degrees
+        lon: Longitudes in degrees
+        distance: Distances to travel in meters
+        brg: Bearings in degrees
+
+    Returns:
+        Tuple of (lats, lons) arrays in degrees
+    """
+    angular = np.asarray(distance, dtype=float) / EARTH_RADIUS
+    brg = np.radians(brg)
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2 = np.arcsin(np.sin(lat1) * np.cos(angular) + np.cos(lat1) * np.sin(angular) * np.cos(brg))
+    lon2 = lon1 + np.arctan2(np.sin(brg) * np.sin(angular) * np.cos(lat1),
+                             np.cos(angular) - np.sin(lat1) * np.sin(lat2))
+    return np.degrees(lat2), np.degrees(lon2)
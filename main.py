@@ -2,10 +2,9 @@
 FastAPI application for object simulation system
 """
 
-import json
 import asyncio
+import math
 import threading
-from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import FastAPI, BackgroundTasks, HTTPException
@@ -13,7 +12,10 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+import config
 from simulator import ObjectSimulator
+from scenario import CompiledScenario, convert_timestamps, open_scenario
+from engine import SimulationEngine
 import send_random_radar
 import send_random_radar_decoy
 import trigger_drone_attack
@@ -44,42 +46,15 @@ running_tasks = {
     "rocket_attack": False
 }
 
+# Engines of the running simulations, so endpoints can control them (seek, pause, resume)
+active_engines = {}
+
 
 class StatusResponse(BaseModel):
     status: str
     message: str
 
 
-def convert_timestamps(obj):
-    """Recursively convert all timestamp fields in the data into datetime objects."""
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            # Convert known timestamp formats
-            if isinstance(value, str):
-                try:
-                    # Try parsing ISO-style timestamps
-                    obj[key] = datetime.fromisoformat(value.replace("Z", "+00:00"))
-                except ValueError:
-                    pass
-            elif isinstance(value, dict) and "seconds" in value and "nanoseconds" in value:
-                # Firebase timestamp format
-                seconds = value["seconds"]
-                nanos = value.get("nanoseconds", 0)
-                obj[key] = datetime.fromtimestamp(seconds + nanos / 1e9, tz=timezone.utc)
-            else:
-                obj[key] = convert_timestamps(value)
-    elif isinstance(obj, list):
-        obj = [convert_timestamps(item) for item in obj]
-    return obj
-
-
-def load_data_with_timestamps(path):
-    """Load JSON file and convert all timestamp-like fields."""
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return convert_timestamps(data)
-
-
 # Background task functions
 def run_random_radar():
     """Run the random radar generation in background"""
@@ -133,91 +108,37 @@ def run_random_radar_decoy():
         print("Random radar decoy stopped")
 
 
-def run_main_simulation():
-    """Run the main simulation with simulated_flights7.json"""
+def run_main_simulation(time_scale: Optional[float] = None, start_offset: Optional[float] = None):
+    """
+    Run the main simulation with the scenario at config.SCENARIO_PATH
+    
+    Args:
+        time_scale: Replay speed (1 = real time, 0 = as fast as possible),
+            defaults to config.TIME_SCALE
+        start_offset: Simulation time in seconds to start from instead of the beginning
+    """
     running_tasks["main_simulation"] = True
+    courses = None
     try:
         print("Fetching course data...")
-        courses = load_data_with_timestamps("simulated_flights7.json")
-        if not courses:
-            print("No courses found in the database!")
-            return
-
-        print(f"Found {len(courses)} courses")
+        courses = open_scenario(config.SCENARIO_PATH)
 
-        # Create and run simulator
+        # Create and run simulator, checking for the stop signal every tick
         simulator = ObjectSimulator(courses)
-
-        # Modified run loop to check for stop signal
-        if not simulator.prepare_simulation():
-            return
-
-        print("\n" + "=" * 60)
-        print("Starting simulation...")
-        print("=" * 60 + "\n")
-
-        import time
-        real_start_time = time.time()
-        total_duration = simulator._get_total_duration()
-        objects_marked_deleted = set()
-
-        while simulator.current_simulation_time <= total_duration and running_tasks["main_simulation"]:
-            tick_start = time.time()
-
-            # Get points that should be processed at this time
-            points_to_process = simulator._get_points_to_process()
-
-            if points_to_process:
-                print(f"[T+{simulator.current_simulation_time:.1f}s] Processing {len(points_to_process)} points...")
-
-                # Group points by object ID
-                updates_by_object = {}
-                for item in points_to_process:
-                    obj_id = item['object_id']
-                    if obj_id not in updates_by_object:
-                        updates_by_object[obj_id] = []
-                    updates_by_object[obj_id].append(item)
-
-                # Update each object and send to API
-                for object_id, items in updates_by_object.items():
-                    for item in items:
-                        simulator._update_object_state(object_id, item['point'])
-                        simulator.processed_point_indices.add(item['index'])
-
-                    # Send update after all points for this tick are added
-                    simulator._send_object_update(object_id)
-
-            # Check for inactive objects
-            inactive_objects = simulator._check_inactive_objects()
-            for object_id in inactive_objects:
-                if object_id not in objects_marked_deleted:
-                    print(f"[T+{simulator.current_simulation_time:.1f}s] Marking inactive object as deleted...")
-                    simulator._send_object_update(object_id, is_delete=True)
-                    objects_marked_deleted.add(object_id)
-
-            # Move to next time step
-            simulator.current_simulation_time += 1  # Using config.TICK_INTERVAL
-
-            # Sleep to maintain real-time simulation
-            elapsed = time.time() - tick_start
-            sleep_time = max(0, 1 - elapsed)  # Using config.TICK_INTERVAL
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-
-        # Final summary
-        print("\n" + "=" * 60)
-        if running_tasks["main_simulation"]:
-            print("Simulation complete!")
-        else:
-            print("Simulation stopped by user!")
-        print("=" * 60)
-        print(f"Total simulation time: {total_duration:.1f} seconds")
-        print(f"Total real time: {time.time() - real_start_time:.1f} seconds")
-        print(f"Total points processed: {len(simulator.processed_point_indices)}")
-        print(f"Objects marked as deleted: {len(objects_marked_deleted)}")
+        engine = SimulationEngine(
+            simulator,
+            should_continue=lambda: running_tasks["main_simulation"],
+            time_scale=time_scale
+        )
+        active_engines["main_simulation"] = engine
+        engine.run(start_offset=start_offset)
 
     finally:
+        if isinstance(courses, CompiledScenario):
+            courses.close()
+        # Clear the flag before releasing the engine: /simulation/start waits for both
         running_tasks["main_simulation"] = False
+        active_engines.pop("main_simulation", None)
         print("Main simulation stopped")
 
 
@@ -233,12 +154,15 @@ async def root():
             "/radar/stop": "Stop random radar generation",
             "/radar/decoy/start": "Start random radar decoy generation",
             "/radar/decoy/stop": "Stop random radar decoy generation",
-            "/attack/drone/start": "Trigger a drone attack",
+            "/attack/drone/start": "Trigger a drone attack, optional ?seed= to replay a cached track",
             "/attack/drone/stop": "Stop drone attack",
             "/attack/rocket/start": "Trigger a rocket attack",
             "/attack/rocket/stop": "Stop rocket attack",
-            "/simulation/start": "Start main simulation (simulated_flights7.json)",
+            "/simulation/start": "Start main simulation (SCENARIO_PATH), optional ?time_scale= and ?start_offset=",
             "/simulation/stop": "Stop main simulation",
+            "/simulation/pause": "Pause main simulation (state stays loaded)",
+            "/simulation/resume": "Resume paused main simulation",
+            "/simulation/seek": "Jump the main simulation to ?offset= seconds",
             "/simulation/stop-all": "Stop all running tasks",
             "/simulation/status": "Get status of all running tasks"
         }
@@ -305,8 +229,8 @@ async def stop_random_radar_decoy():
     )
 
 
-def run_drone_attack():
-    """Run drone attack in background with stop capability"""
+def run_drone_attack(seed=None):
+    """Run drone attack in background with stop capability (seeded tracks come from the scenario cache)"""
     running_tasks["drone_attack"] = True
     try:
         print("\n🚨 Triggering drone attack...")
@@ -315,51 +239,17 @@ def run_drone_attack():
         from all import create_drone_track_simulation
         
         # Create the drone track
-        drone_track = create_drone_track_simulation(offset_seconds=10)
+        drone_track = create_drone_track_simulation(offset_seconds=10, seed=seed)
         print(f"✅ Drone track created with {len(drone_track.get('points', []))} points")
         
         # Convert timestamps and run with stop checks
         converted_track = convert_timestamps(drone_track)
         simulator = ObjectSimulator([converted_track])
         
-        # Run simulation with stop checks (same logic as main simulation)
-        if not simulator.prepare_simulation():
-            return
-        
+        # Run simulation with stop checks (same engine as main simulation)
         print("Starting drone attack simulation...")
-        import time
-        total_duration = simulator._get_total_duration()
-        objects_marked_deleted = set()
-        
-        while simulator.current_simulation_time <= total_duration and running_tasks["drone_attack"]:
-            tick_start = time.time()
-            points_to_process = simulator._get_points_to_process()
-            
-            if points_to_process:
-                updates_by_object = {}
-                for item in points_to_process:
-                    obj_id = item['object_id']
-                    if obj_id not in updates_by_object:
-                        updates_by_object[obj_id] = []
-                    updates_by_object[obj_id].append(item)
-                
-                for object_id, items in updates_by_object.items():
-                    for item in items:
-                        simulator._update_object_state(object_id, item['point'])
-                        simulator.processed_point_indices.add(item['index'])
-                    simulator._send_object_update(object_id)
-            
-            inactive_objects = simulator._check_inactive_objects()
-            for object_id in inactive_objects:
-                if object_id not in objects_marked_deleted:
-                    simulator._send_object_update(object_id, is_delete=True)
-                    objects_marked_deleted.add(object_id)
-            
-            simulator.current_simulation_time += 1
-            elapsed = time.time() - tick_start
-            sleep_time = max(0, 1 - elapsed)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+        engine = SimulationEngine(simulator, should_continue=lambda: running_tasks["drone_attack"])
+        engine.run()
         
         if running_tasks["drone_attack"]:
             print("✅ Drone attack completed!")
@@ -376,15 +266,23 @@ def run_drone_attack():
 
 
 @app.post("/attack/drone/start", response_model=StatusResponse)
-async def start_drone_attack():
-    """Trigger a drone attack simulation"""
+async def start_drone_attack(seed: Optional[int] = None):
+    """
+    Trigger a drone attack simulation
+    
+    Pass seed (or set SCENARIO_SEED) to replay the same drone track every time;
+    seeded tracks are generated once and then reused from the scenario cache.
+    """
     if running_tasks["drone_attack"]:
         raise HTTPException(status_code=400, detail="Drone attack is already running")
+    if seed is None:
+        seed = config.SCENARIO_SEED
     
     try:
         # Run the drone attack trigger in background
         thread = threading.Thread(
             target=run_drone_attack,
+            args=(seed,),
             daemon=True
         )
         thread.start()
@@ -431,44 +329,10 @@ def run_rocket_attack():
         converted_track = convert_timestamps(rocket_track)
         simulator = ObjectSimulator([converted_track])
         
-        # Run simulation with stop checks (same logic as main simulation)
-        if not simulator.prepare_simulation():
-            return
-        
+        # Run simulation with stop checks (same engine as main simulation)
         print("Starting rocket attack simulation...")
-        import time
-        total_duration = simulator._get_total_duration()
-        objects_marked_deleted = set()
-        
-        while simulator.current_simulation_time <= total_duration and running_tasks["rocket_attack"]:
-            tick_start = time.time()
-            points_to_process = simulator._get_points_to_process()
-            
-            if points_to_process:
-                updates_by_object = {}
-                for item in points_to_process:
-                    obj_id = item['object_id']
-                    if obj_id not in updates_by_object:
-                        updates_by_object[obj_id] = []
-                    updates_by_object[obj_id].append(item)
-                
-                for object_id, items in updates_by_object.items():
-                    for item in items:
-                        simulator._update_object_state(object_id, item['point'])
-                        simulator.processed_point_indices.add(item['index'])
-                    simulator._send_object_update(object_id)
-            
-            inactive_objects = simulator._check_inactive_objects()
-            for object_id in inactive_objects:
-                if object_id not in objects_marked_deleted:
-                    simulator._send_object_update(object_id, is_delete=True)
-                    objects_marked_deleted.add(object_id)
-            
-            simulator.current_simulation_time += 1
-            elapsed = time.time() - tick_start
-            sleep_time = max(0, 1 - elapsed)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+        engine = SimulationEngine(simulator, should_continue=lambda: running_tasks["rocket_attack"])
+        engine.run()
         
         if running_tasks["rocket_attack"]:
             print("✅ Rocket attack completed!")
@@ -521,18 +385,35 @@ async def stop_rocket_attack():
 
 
 @app.post("/simulation/start", response_model=StatusResponse)
-async def start_main_simulation():
-    """Start the main simulation using simulated_flights7.json"""
+async def start_main_simulation(time_scale: Optional[float] = None, start_offset: Optional[float] = None):
+    """
+    Start the main simulation using the scenario at config.SCENARIO_PATH
+    
+    Pass time_scale to replay faster than real time (e.g. 10 or 100),
+    or time_scale=0 to replay as fast as possible for load testing.
+    Pass start_offset (seconds) to begin in the middle of the scenario.
+    """
     if running_tasks["main_simulation"]:
         raise HTTPException(status_code=400, detail="Main simulation is already running")
+    if "main_simulation" in active_engines:
+        raise HTTPException(status_code=400, detail="Previous main simulation is still stopping, try again")
+    if time_scale is not None and (not math.isfinite(time_scale) or time_scale < 0):
+        raise HTTPException(status_code=400, detail="time_scale must be a finite number >= 0")
+    if start_offset is not None and (not math.isfinite(start_offset) or start_offset < 0):
+        raise HTTPException(status_code=400, detail="start_offset must be a finite number >= 0")
     
     # Start in background thread
-    thread = threading.Thread(target=run_main_simulation, daemon=True)
+    thread = threading.Thread(target=run_main_simulation, args=(time_scale, start_offset), daemon=True)
     thread.start()
     
+    speed = ""
+    if time_scale == 0:
+        speed = " (unthrottled)"
+    elif time_scale is not None and time_scale != 1:
+        speed = f" ({time_scale:g}x real time)"
     return StatusResponse(
         status="success",
-        message="Main simulation started with simulated_flights7.json"
+        message=f"Main simulation started with {config.SCENARIO_PATH}{speed}"
     )
 
 
@@ -543,6 +424,9 @@ async def stop_main_simulation():
         raise HTTPException(status_code=400, detail="Main simulation is not running")
     
     running_tasks["main_simulation"] = False
+    engine = active_engines.get("main_simulation")
+    if engine is not None:
+        engine.wake()
     
     return StatusResponse(
         status="success",
@@ -550,6 +434,57 @@ async def stop_main_simulation():
     )
 
 
+@app.post("/simulation/pause", response_model=StatusResponse)
+async def pause_main_simulation():
+    """Pause the main simulation, keeping its state loaded so it can resume instantly"""
+    engine = active_engines.get("main_simulation")
+    if not running_tasks["main_simulation"] or engine is None:
+        raise HTTPException(status_code=400, detail="Main simulation is not running")
+    if engine.paused:
+        raise HTTPException(status_code=400, detail="Main simulation is already paused")
+    
+    engine.pause()
+    
+    return StatusResponse(
+        status="success",
+        message="Main simulation paused"
+    )
+
+
+@app.post("/simulation/resume", response_model=StatusResponse)
+async def resume_main_simulation():
+    """Resume a paused main simulation from where it stopped"""
+    engine = active_engines.get("main_simulation")
+    if not running_tasks["main_simulation"] or engine is None:
+        raise HTTPException(status_code=400, detail="Main simulation is not running")
+    if not engine.paused:
+        raise HTTPException(status_code=400, detail="Main simulation is not paused")
+    
+    engine.resume()
+    
+    return StatusResponse(
+        status="success",
+        message="Main simulation resumed"
+    )
+
+
+@app.post("/simulation/seek", response_model=StatusResponse)
+async def seek_main_simulation(offset: float):
+    """Jump the running main simulation to a simulation time (seconds from its start)"""
+    engine = active_engines.get("main_simulation")
+    if not running_tasks["main_simulation"] or engine is None:
+        raise HTTPException(status_code=400, detail="Main simulation is not running")
+    if not math.isfinite(offset) or offset < 0:
+        raise HTTPException(status_code=400, detail="offset must be a finite number >= 0")
+    
+    engine.request_seek(offset)
+    
+    return StatusResponse(
+        status="success",
+        message=f"Main simulation seeking to T+{offset:.1f}s"
+    )
+
+
 @app.post("/simulation/stop-all", response_model=StatusResponse)
 async def stop_all_simulations():
     """Stop all running simulations and tasks"""
@@ -565,6 +500,9 @@ async def stop_all_simulations():
     
     if running_tasks["main_simulation"]:
         running_tasks["main_simulation"] = False
+        engine = active_engines.get("main_simulation")
+        if engine is not None:
+            engine.wake()
         stopped_tasks.append("main_simulation")
     
     if running_tasks["drone_attack"]:
@@ -590,10 +528,15 @@ async def stop_all_simulations():
 @app.get("/simulation/status")
 async def get_simulation_status():
     """Get the status of all running tasks"""
+    main_status = "running" if running_tasks["main_simulation"] else "stopped"
+    engine = active_engines.get("main_simulation")
+    if main_status == "running" and engine is not None and engine.paused:
+        main_status = "paused"
+    
     return {
         "random_radar": "running" if running_tasks["random_radar"] else "stopped",
         "random_radar_decoy": "running" if running_tasks["random_radar_decoy"] else "stopped",
-        "main_simulation": "running" if running_tasks["main_simulation"] else "stopped",
+        "main_simulation": main_status,
         "drone_attack": "running" if running_tasks["drone_attack"] else "stopped",
         "rocket_attack": "running" if running_tasks["rocket_attack"] else "stopped"
     }
@@ -615,6 +558,9 @@ if __name__ == "__main__":
     print("  POST /attack/rocket/stop    - Stop rocket attack")
     print("  POST /simulation/start      - Start main simulation")
     print("  POST /simulation/stop       - Stop main simulation")
+    print("  POST /simulation/pause      - Pause main simulation")
+    print("  POST /simulation/resume     - Resume main simulation")
+    print("  POST /simulation/seek       - Jump main simulation to ?offset=")
     print("  POST /simulation/stop-all   - Stop ALL running tasks")
     print("  GET  /simulation/status     - Get status of tasks")
     print("\nDocs available at: http://localhost:8000/docs")
@@ -0,0 +1,109 @@
+"""
+Local stand-in for the target API
+
+Accepts the same requests the simulator sends (per-object updates, batched
+updates, classifications and radar points), keeps a little per-object state and
+prints what it received. Useful for trying out the simulator, batch mode and
+accelerated replays without the real backend.
+
+Usage:
+    python mock_receiver.py [port]
+"""
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import config
+
+# Received state, guarded by state_lock
+state_lock = threading.Lock()
+objects = {}  # object id -> number of plots known for it
+stats = {"requests": 0, "updates": 0, "deletes": 0, "classifications": 0, "radar_points": 0}
+
+
+def apply_object_update(body):
+    """
+    Apply one object body, as posted to OBJECTS_ENDPOINT or found inside a batch
+    
+    Args:
+        body: The transformed object body
+    """
+    details = body.get("details") or {}
+    object_id = body.get("id") or details.get("object_id")
+
+    if details.get("is_delete"):
+        objects.pop(object_id, None)
+        stats["deletes"] += 1
+        return
+
+    plots = body.get("plots") or []
+    if body.get("update_type") == "delta":
+        objects[object_id] = objects.get(object_id, 0) + len(plots)
+    else:
+        objects[object_id] = len(plots)
+    stats["updates"] += 1
+
+
+class ReceiverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            self._respond(400, {"error": "invalid JSON"})
+            return
+
+        with state_lock:
+            stats["requests"] += 1
+            if self.path == config.BATCH_ENDPOINT:
+                for update in body.get("updates", []):
+                    apply_object_update(update)
+                print(f"[BATCH] T+{body.get('sim_time')}s: {len(body.get('updates', []))} updates, "
+                      f"{len(objects)} active objects")
+            elif self.path == config.OBJECTS_ENDPOINT:
+                apply_object_update(body)
+            elif self.path == "/objects/classify":
+                stats["classifications"] += 1
+                print(f"[CLASSIFY] {body.get('id')}")
+            elif self.path == "/objects/radar-point":
+                stats["radar_points"] += 1
+            else:
+                self._respond(404, {"error": f"unknown endpoint {self.path}"})
+                return
+
+        self._respond(200, {"status": "ok"})
+
+    def do_GET(self):
+        with state_lock:
+            self._respond(200, {"stats": stats, "objects": objects})
+
+    def _respond(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 3001
+    server = ThreadingHTTPServer(("0.0.0.0", port), ReceiverHandler)
+    print(f"Mock receiver listening on http://localhost:{port}")
+    print(f"  POST {config.OBJECTS_ENDPOINT}, {config.BATCH_ENDPOINT}, /objects/classify, /objects/radar-point")
+    print("  GET  any path for received stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+        print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
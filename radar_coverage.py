@@ -0,0 +1,142 @@
+"""
+Grid index of radar coverage for fast detection lookups
+
+The globe is split into lat/lon cells of CELL_SIZE_DEG degrees. When the index is built,
+every radar is attached to the cells its range circle touches, marked as covering the
+whole cell or only part of it. A lookup is then one dict access plus an exact distance
+check against the partially covering radars of the point's cell, instead of a distance
+check against every radar.
+
+Radars use the all.RADARS layout: {"name", "lat", "lng", "range"} with range in meters.
+"""
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+
+import geodesy
+from geodesy import EARTH_RADIUS, haversine
+
+CELL_SIZE_DEG = 0.25
+
+
+class RadarCoverageIndex:
+    """
+    Radar coverage by grid cell
+
+    Build it once from a list of radars; rebuild it if the radars change.
+    Lookups return radars in the order of the list they were built from.
+    """
+
+    def __init__(self, radars: List[Dict[str, Any]], cell_size_deg: float = CELL_SIZE_DEG):
+        self.radars = radars
+        self.cell_size = cell_size_deg
+        self._columns = int(round(360 / cell_size_deg))
+
+        cells: Dict[Tuple[int, int], List[Tuple[Dict[str, Any], bool]]] = {}
+        for radar in radars:
+            for key, whole in self._covered_cells(radar):
+                cells.setdefault(key, []).append((radar, whole))
+        # (row, col) -> ((radar, covers_whole_cell), ...) in radar order
+        self._cells = {key: tuple(entries) for key, entries in cells.items()}
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size) % self._columns
+
+    def _covered_cells(self, radar: Dict[str, Any]):
+        """Yield ((row, col), covers_whole_cell) for every cell within the radar's range"""
+        size = self.cell_size
+        angular = math.degrees(radar["range"] / EARTH_RADIUS)
+        lat_min = max(-90.0, radar["lat"] - angular - size)
+        lat_max = min(90.0, radar["lat"] + angular + size)
+
+        # Longitude span at the most poleward latitude of the range (whole circle near the poles)
+        poleward = max(abs(lat_min), abs(lat_max))
+        if poleward >= 89.0:
+            columns = range(self._columns)
+        else:
+            span = angular / math.cos(math.radians(poleward)) + size
+            first, last = math.floor((radar["lng"] - span) / size), math.floor((radar["lng"] + span) / size)
+            # A span of the whole circle would visit (wrapped) columns twice
+            columns = range(self._columns) if last - first + 1 >= self._columns else range(first, last + 1)
+
+        for row in range(math.floor(lat_min / size), math.floor(lat_max / size) + 1):
+            south = row * size
+            north = south + size
+            center_lat = south + size / 2
+            # Farthest point of the cell from its center (an equatorward corner), with a safety margin
+            circumradius = haversine(center_lat, 0.0, south if center_lat >= 0 else north, size / 2) * 1.001 + 1.0
+
+            for col in columns:
+                center_lon = col * size + size / 2
+                distance = haversine(center_lat, center_lon, radar["lat"], radar["lng"])
+                if distance - circumradius > radar["range"]:
+                    continue
+                yield (row, col % self._columns), distance + circumradius <= radar["range"]
+
+    def candidates(self, lat: float, lon: float) -> Sequence[Tuple[Dict[str, Any], bool]]:
+        """
+        Radars whose range touches the point's cell
+
+        Returns:
+            (radar, covers_whole_cell) pairs; radars that only partly cover the cell still
+            need a distance check
+        """
+        return self._cells.get(self._cell(lat, lon), ())
+
+    def detect(self, lat: float, lon: float) -> List[Dict[str, Any]]:
+        """
+        Radars that can detect the given position
+
+        Args:
+            lat: Latitude of the point
+            lon: Longitude of the point
+
+        Returns:
+            List of radar dicts
+        """
+        return [radar for radar, whole in self.candidates(lat, lon)
+                if whole or haversine(lat, lon, radar["lat"], radar["lng"]) <= radar["range"]]
+
+    def detect_many(self, lats: Sequence[float], lons: Sequence[float]) -> List[List[Dict[str, Any]]]:
+        """
+        Radars that can detect each position of a track, in one batch
+
+        Points are grouped by cell and the partially covering radars of each cell are
+        checked with one vectorized distance computation (falls back to detect() per
+        point without NumPy).
+
+        Args:
+            lats: Latitudes of the points
+            lons: Longitudes of the points
+
+        Returns:
+            One list of radar dicts per point
+        """
+        if not geodesy.HAS_NUMPY:
+            return [self.detect(lat, lon) for lat, lon in zip(lats, lons)]
+
+        np = geodesy.np
+        lat_array = np.asarray(lats, dtype=float)
+        lon_array = np.asarray(lons, dtype=float)
+        rows = np.floor(lat_array / self.cell_size).astype(np.int64).tolist()
+        cols = (np.floor(lon_array / self.cell_size).astype(np.int64) % self._columns).tolist()
+
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for index, key in enumerate(zip(rows, cols)):
+            groups.setdefault(key, []).append(index)
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in range(len(rows))]
+        for key, indices in groups.items():
+            entries = self._cells.get(key)
+            if not entries:
+                continue
+            index_array = np.asarray(indices)
+            for radar, whole in entries:
+                if whole:
+                    hits = indices
+                else:
+                    distances = geodesy.haversine_array(lat_array[index_array], lon_array[index_array],
+                                                        radar["lat"], radar["lng"])
+                    hits = index_array[distances <= radar["range"]].tolist()
+                for index in hits:
+                    results[index].append(radar)
+        return results
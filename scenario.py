@@ -0,0 +1,503 @@
+"""
+Scenario loading: JSON scenario files and the compiled binary scenario format
+
+A compiled scenario (.simbin) stores every point as columnar arrays so it can be
+memory-mapped and read without parsing:
+
+    magic           8 bytes   b"SIMSCN01"
+    header length   uint32    little-endian
+    header          JSON      byte order, string table, per-course metadata and row ranges
+    padding                   up to an 8-byte boundary
+    float64 columns           time (UTC epoch seconds), lat, lon, altitude, speed_kts,
+                              bearing, rotation, original_lat, original_lon (NaN = missing)
+    uint32 columns            point_id, detected_by_radar (index into the string table,
+                              0xFFFFFFFF = missing)
+    uint16 column             per-row bit flags marking numeric values that were integers
+
+Each course's points are one contiguous row range, sorted by time.
+
+Usage:
+    python scenario.py compile simulated_flights7.json simulated_flights7.simbin
+    python scenario.py info simulated_flights7.simbin
+"""
+import argparse
+import json
+import math
+import mmap
+import struct
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List
+
+MAGIC = b"SIMSCN01"
+FLOAT_COLUMNS = ["time", "lat", "lon", "altitude", "speed_kts", "bearing", "rotation",
+                 "original_lat", "original_lon"]
+STRING_COLUMNS = ["point_id", "detected_by_radar"]
+MISSING_STRING = 0xFFFFFFFF
+
+# Key order of decoded points, matching the points produced by all.simulate_aircraft
+POINT_FIELDS = ["timestamp", "lat", "lon", "altitude", "speed_kts", "bearing", "rotation",
+                "point_id", "detected_by_radar", "original_lat", "original_lon"]
+_POINT_FIELD_SET = frozenset(POINT_FIELDS)
+_MISSING = object()
+
+
+JSON_CHUNK_SIZE = 1 << 16  # characters read at a time when streaming a JSON scenario
+
+# Fields that hold timestamps, at any nesting level (courses and their points)
+TIMESTAMP_FIELDS = ("timestamp", "created_at", "updated_at")
+
+
+def parse_timestamp(value):
+    """
+    Convert one timestamp value into a datetime
+    
+    Args:
+        value: ISO string, Firebase {"seconds", "nanoseconds"} dict or datetime
+
+    Returns:
+        datetime, or the value unchanged if it is not a recognizable timestamp
+    """
+    if isinstance(value, str):
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, dict) and "seconds" in value and "nanoseconds" in value:
+        # Firebase timestamp format
+        return datetime.fromtimestamp(value["seconds"] + value["nanoseconds"] / 1e9, tz=timezone.utc)
+    return value
+
+
+class TrackPoint:
+    """
+    One point of a track, stored in slots instead of a dict
+
+    Supports the read-only dict access the simulator and transform_to_schema use
+    (get, [], in), so it can stand in for a point dict; fields outside POINT_FIELDS
+    are kept in a small extra dict.
+    """
+    __slots__ = tuple(POINT_FIELDS) + ("extra",)
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Args:
+            data: Point dict, as found in a scenario's course points
+        """
+        extra = None
+        for key, value in data.items():
+            if key in _POINT_FIELD_SET:
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra = extra
+
+    def get(self, key, default=None):
+        if key in _POINT_FIELD_SET:
+            return getattr(self, key, default)
+        return self.extra.get(key, default) if self.extra else default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to a point dict (fields in POINT_FIELDS order, then any extras)"""
+        data = {}
+        for field in POINT_FIELDS:
+            value = getattr(self, field, _MISSING)
+            if value is not _MISSING:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self) -> str:
+        return f"TrackPoint({self.to_dict()!r})"
+
+
+def convert_timestamps(obj):
+    """
+    Convert the timestamp fields (TIMESTAMP_FIELDS) in the data into datetime objects
+    
+    Only the known timestamp fields are parsed; names, colors and message text are
+    left alone instead of being trial-parsed.
+    """
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key in TIMESTAMP_FIELDS:
+                obj[key] = parse_timestamp(value)
+            elif isinstance(value, (dict, list)):
+                obj[key] = convert_timestamps(value)
+    elif isinstance(obj, list):
+        for index, item in enumerate(obj):
+            if isinstance(item, (dict, list)):
+                obj[index] = convert_timestamps(item)
+    return obj
+
+
+def load_data_with_timestamps(path):
+    """Load JSON file and convert all timestamp-like fields."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return convert_timestamps(data)
+
+
+def iter_courses(path, convert: bool = True, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the courses of a JSON scenario (a top-level array) one at a time
+    
+    The file is read in chunks and each course is decoded as soon as it is complete,
+    so only one course is held in memory besides the caller's own data.
+
+    Args:
+        path: Path to the JSON scenario file
+        convert: Convert timestamp fields into datetimes (see convert_timestamps)
+        chunk_size: Characters to read at a time
+
+    Yields:
+        Course dicts
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{path}: expected a JSON array of courses")
+        pos = 1
+        eof = False
+
+        while True:
+            # Skip whitespace and the separator before the next course
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+
+            try:
+                course, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The course continues past the buffer: read more (at least doubling the
+                # buffer, so a large course is not re-parsed once per chunk)
+                more = f.read(max(chunk_size, len(buffer) - pos))
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+
+            yield convert_timestamps(course) if convert else course
+            pos = end
+
+
+def open_scenario(path):
+    """
+    Open a scenario for ObjectSimulator without decoding more than necessary
+    
+    Compiled .simbin files are memory-mapped and their points decoded lazily as the
+    simulation reaches them; JSON files are streamed one course at a time.
+
+    Args:
+        path: Path to the scenario file
+
+    Returns:
+        CompiledScenario (close it when done) or an iterator of course dicts
+    """
+    if path.endswith(".simbin"):
+        return CompiledScenario(path)
+    return iter_courses(path)
+
+
+def load_scenario(path):
+    """
+    Load a scenario as a list of courses, from JSON or a compiled .simbin file
+
+    Args:
+        path: Path to the scenario file
+
+    Returns:
+        List of course dicts with datetime timestamps
+    """
+    if path.endswith(".simbin"):
+        scenario = CompiledScenario(path)
+        try:
+            return scenario.to_courses()
+        finally:
+            scenario.close()
+    return load_data_with_timestamps(path)
+
+
+def to_epoch(value) -> float:
+    """
+    Convert a raw timestamp value to UTC epoch seconds
+
+    Args:
+        value: ISO string, datetime, or Firebase {"seconds", "nanoseconds"} dict
+
+    Returns:
+        Seconds since the epoch (naive timestamps are taken as UTC)
+    """
+    if isinstance(value, dict):
+        return value["seconds"] + value.get("nanoseconds", 0) / 1e9
+    value = parse_timestamp(value)
+    if not isinstance(value, datetime):
+        raise ValueError(f"Unrecognized timestamp: {value!r}")
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def compile_scenario(courses: List[Dict[str, Any]], path: str) -> int:
+    """
+    Write courses to the compiled scenario format
+
+    Args:
+        courses: Raw courses as loaded from the JSON scenario (timestamps may be
+            strings, datetimes or Firebase timestamp dicts)
+        path: Output file path
+
+    Returns:
+        Number of points written
+    """
+    floats = {name: array("d") for name in FLOAT_COLUMNS}
+    strings = {name: array("I") for name in STRING_COLUMNS}
+    int_flags = array("H")
+    string_table = []
+    string_index = {}
+    course_headers = []
+    dropped_fields = set()
+    row = 0
+
+    def intern(value):
+        if value not in string_index:
+            string_index[value] = len(string_table)
+            string_table.append(value)
+        return string_index[value]
+
+    for course in courses:
+        start = row
+        # Rows are stored in time order within each course, which lets the loader merge
+        # courses into one timeline without sorting
+        timed_points = [(to_epoch(point["timestamp"]), point)
+                        for point in course.get("points", []) if "timestamp" in point]
+        timed_points.sort(key=lambda item: item[0])
+        for epoch, point in timed_points:
+            flags = 0
+            floats["time"].append(epoch)
+            for bit, name in enumerate(FLOAT_COLUMNS[1:], start=1):
+                value = point.get(name)
+                if value is None:
+                    floats[name].append(math.nan)
+                else:
+                    floats[name].append(float(value))
+                    if isinstance(value, int):
+                        flags |= 1 << bit
+            for name in STRING_COLUMNS:
+                value = point.get(name)
+                strings[name].append(MISSING_STRING if value is None else intern(str(value)))
+            int_flags.append(flags)
+
+            dropped_fields.update(key for key in point if key not in POINT_FIELDS)
+            row += 1
+
+        meta = {k: v for k, v in course.items() if k != "points"}
+        course_headers.append({"meta": meta, "start": start, "count": row - start})
+
+    if dropped_fields:
+        print(f"⚠️  Point fields not supported by the compiled format were dropped: {sorted(dropped_fields)}")
+
+    header = json.dumps({
+        "version": 1,
+        "byteorder": sys.byteorder,
+        "rows": row,
+        "strings": string_table,
+        "courses": course_headers
+    }, ensure_ascii=False, default=str).encode("utf-8")
+    padding = -(len(MAGIC) + 4 + len(header)) % 8
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * padding)
+        for name in FLOAT_COLUMNS:
+            f.write(floats[name].tobytes())
+        for name in STRING_COLUMNS:
+            f.write(strings[name].tobytes())
+        f.write(int_flags.tobytes())
+
+    return row
+
+
+class CompiledScenario:
+    """
+    Read-only, memory-mapped view of a compiled scenario file
+
+    Columns are exposed as memoryviews straight over the mapping, so opening a
+    scenario only parses the small header; point rows are decoded on demand.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path to a .simbin file written by compile_scenario
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a compiled scenario file")
+
+        (header_length,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mmap[header_start:header_start + header_length].decode("utf-8"))
+        self.rows = header["rows"]
+        self.strings = header["strings"]
+        self.course_headers = header["courses"]
+
+        offset = header_start + header_length
+        offset += -offset % 8
+        swap = header["byteorder"] != sys.byteorder
+        view = memoryview(self._mmap)
+
+        self.columns = {}
+        for names, typecode in ((FLOAT_COLUMNS, "d"), (STRING_COLUMNS, "I"), (["int_flags"], "H")):
+            size = array(typecode).itemsize * self.rows
+            for name in names:
+                column = view[offset:offset + size].cast(typecode)
+                if swap:
+                    # Foreign byte order: fall back to an in-memory, byte-swapped copy
+                    column = array(typecode, column.tobytes())
+                    column.byteswap()
+                self.columns[name] = column
+                offset += size
+
+    def __len__(self) -> int:
+        return len(self.course_headers)
+
+    def course_meta(self, index: int) -> Dict[str, Any]:
+        """Get a course's metadata (everything except its points), with datetimes converted"""
+        return convert_timestamps(dict(self.course_headers[index]["meta"]))
+
+    def decode_point(self, row: int) -> Dict[str, Any]:
+        """
+        Decode one point row into the same dict shape as a JSON scenario point
+
+        Args:
+            row: Row index in the file
+
+        Returns:
+            Point dict with a UTC datetime timestamp; missing fields are omitted
+        """
+        columns = self.columns
+        flags = columns["int_flags"][row]
+        point = {"timestamp": datetime.fromtimestamp(columns["time"][row], tz=timezone.utc)}
+        for field in POINT_FIELDS[1:]:
+            if field in STRING_COLUMNS:
+                value = columns[field][row]
+                if value != MISSING_STRING:
+                    point[field] = self.strings[value]
+            else:
+                value = columns[field][row]
+                if value == value:  # NaN marks a missing value
+                    point[field] = int(value) if flags & (1 << FLOAT_COLUMNS.index(field)) else value
+        return point
+
+    def course_ranges(self) -> List[range]:
+        """Get the rows of every course; each range is in time order"""
+        return [range(h["start"], h["start"] + h["count"]) for h in self.course_headers]
+
+    def to_courses(self) -> List[Dict[str, Any]]:
+        """Materialize every course with its decoded points"""
+        courses = []
+        for index, course_header in enumerate(self.course_headers):
+            start = course_header["start"]
+            course = self.course_meta(index)
+            course["points"] = [self.decode_point(row) for row in range(start, start + course_header["count"])]
+            courses.append(course)
+        return courses
+
+    def close(self):
+        """Release the mapping"""
+        self.columns = {}
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Some column views are still referenced; the mapping is freed with them
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ScenarioTimeline:
+    """
+    Time-ordered view over the points of a CompiledScenario, used as ObjectSimulator.all_points
+
+    Only row numbers are held in memory; each point is decoded from the mapping when
+    it is indexed.
+    """
+
+    def __init__(self, scenario: CompiledScenario, order: array):
+        """
+        Args:
+            scenario: The open compiled scenario
+            order: Row numbers in global time order
+        """
+        self.scenario = scenario
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, index: int) -> TrackPoint:
+        return TrackPoint(self.scenario.decode_point(self.order[index]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile and inspect scenario files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = subparsers.add_parser("compile", help="Convert a JSON scenario to the compiled format")
+    compile_parser.add_argument("source", help="JSON scenario file")
+    compile_parser.add_argument("output", help="Output .simbin file")
+
+    info_parser = subparsers.add_parser("info", help="Show a compiled scenario's contents")
+    info_parser.add_argument("path", help="Compiled .simbin file")
+
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        courses = iter_courses(args.source, convert=False)
+        rows = compile_scenario(courses, args.output)
+        print(f"✅ Compiled {rows} points -> {args.output}")
+    else:
+        start = time.perf_counter()
+        scenario = CompiledScenario(args.path)
+        elapsed = time.perf_counter() - start
+        print(f"{args.path}: {len(scenario)} courses, {scenario.rows} points, "
+              f"{len(scenario.strings)} strings (opened in {elapsed * 1000:.1f} ms)")
+        for course_header in scenario.course_headers:
+            meta = course_header["meta"]
+            print(f"  {meta.get('_id')}  {meta.get('object_type', ''):<10} "
+                  f"{meta.get('name', ''):<10} {course_header['count']} points")
+        scenario.close()
+
+
+if __name__ == "__main__":
+    main()
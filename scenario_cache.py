@@ -0,0 +1,146 @@
+"""
+Content-addressed cache of generated tracks
+
+A seeded generator run is fully determined by its parameters and seed, so its output is
+stored under a hash of (generator, parameters, seed) in memory and on disk
+(config.SCENARIO_CACHE_DIR). A cached track is stored with the base time it was generated
+at and is shifted to the requested base time on reuse, so the same track can be replayed
+"now" without recomputing it. Unseeded runs are random and never cached.
+
+Bump CACHE_VERSION whenever a generator changes its output for the same seed.
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+import config
+import serialization
+from scenario import TIMESTAMP_FIELDS, parse_timestamp
+
+CACHE_VERSION = 1
+MEMORY_ENTRIES = 64  # tracks kept in memory, least recently used are dropped first
+
+_memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def cache_key(generator: str, params: Dict[str, Any], seed: int) -> str:
+    """
+    Hash a generator run
+
+    Args:
+        generator: Name of the generator, e.g. 'simulate_aircraft'
+        params: JSON-serializable parameters of the run (without seed and base time)
+        seed: Seed of the run
+
+    Returns:
+        Hex SHA-256 digest identifying the generated track
+    """
+    material = json.dumps({"version": CACHE_VERSION, "generator": generator, "params": params, "seed": seed},
+                          sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def shift_timestamps(obj, delta: timedelta):
+    """
+    Return a copy of obj with every timestamp field moved by delta
+
+    Timestamps are written back as ISO 8601 strings with an explicit UTC offset, the
+    format the generators produce.
+    """
+    if isinstance(obj, dict):
+        shifted = {}
+        for key, value in obj.items():
+            if key in TIMESTAMP_FIELDS and isinstance(value, str):
+                parsed = parse_timestamp(value)
+                if isinstance(parsed, datetime):
+                    if parsed.tzinfo is None:
+                        parsed = parsed.replace(tzinfo=timezone.utc)
+                    value = (parsed + delta).isoformat()
+                shifted[key] = value
+            else:
+                shifted[key] = shift_timestamps(value, delta)
+        return shifted
+    if isinstance(obj, list):
+        return [shift_timestamps(item, delta) for item in obj]
+    return obj
+
+
+def _cache_path(key: str) -> Optional[str]:
+    if not config.SCENARIO_CACHE_DIR:
+        return None
+    return os.path.join(config.SCENARIO_CACHE_DIR, f"{key}.json")
+
+
+def _load(key: str) -> Optional[Dict[str, Any]]:
+    """Look a track up in memory, then on disk"""
+    entry = _memory.get(key)
+    if entry is not None:
+        _memory.move_to_end(key)
+        return entry
+
+    path = _cache_path(key)
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable cache entry {path}: {e}")
+        return None
+    _remember(key, entry)
+    return entry
+
+
+def _remember(key: str, entry: Dict[str, Any]):
+    _memory[key] = entry
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def _store(key: str, entry: Dict[str, Any]):
+    """Keep a track in memory and write it to disk (atomically, workers may race)"""
+    _remember(key, entry)
+    path = _cache_path(key)
+    if path is None:
+        return
+    try:
+        os.makedirs(config.SCENARIO_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(serialization.dumps(entry))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️  Could not write cache entry {path}: {e}")
+
+
+def cached_track(generator: str, params: Dict[str, Any], seed: Optional[int], base_time: datetime,
+                 generate: Callable[[datetime], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return a generated track, reusing a cached run of the same generator, parameters and seed
+
+    Args:
+        generator: Name of the generator, part of the cache key
+        params: JSON-serializable parameters of the run, part of the cache key
+        seed: Seed of the run; None generates a fresh random track and skips the cache
+        base_time: Naive UTC time the track starts at
+        generate: Called with base_time to build the track on a cache miss
+
+    Returns:
+        Course dict, a new copy the caller may modify
+    """
+    if seed is None:
+        return generate(base_time)
+
+    key = cache_key(generator, params, seed)
+    entry = _load(key)
+    if entry is None:
+        entry = {"base_time": base_time.isoformat(), "course": generate(base_time)}
+        _store(key, entry)
+    else:
+        print(f"♻️  Reusing cached {generator} track (seed {seed})")
+
+    return shift_timestamps(entry["course"], base_time - datetime.fromisoformat(entry["base_time"]))
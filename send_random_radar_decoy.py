@@ -8,6 +8,7 @@ import time
 from datetime import datetime
 
 from config import API_BASE_URL
+import transport
 
 # Polygon boundaries
 # POLYGON ((33.00293 29.190533, 37.265625 29.190533, 37.265625 33.504759, 33.00293 33.504759, 33.00293 29.190533))
@@ -44,7 +45,7 @@ def send_radar_point(point):
     }
     
     try:
-        response = requests.post(f"{API_URL}{RADAR_ENDPOINT}", json=payload)
+        response = transport.post_json(f"{API_URL}{RADAR_ENDPOINT}", payload)
         response.raise_for_status()
         
         timestamp = datetime.now().strftime("%H:%M:%S")
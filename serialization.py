@@ -0,0 +1,68 @@
+"""
+JSON encoding for outbound payloads
+
+Payloads are encoded to UTF-8 bytes with orjson when it is installed, else with the
+standard library. Both write datetimes as ISO 8601 strings in the same format (UTC as
++00:00), so payloads can carry datetime objects directly. msgspec is not offered: it
+writes UTC as Z, which would make timestamps depend on the installed packages.
+"""
+import json
+from datetime import date, datetime
+
+import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    """Encode values the backends don't handle natively"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None:
+        # e.g. scenario.TrackPoint
+        return to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_orjson(obj) -> bytes:
+    return orjson.dumps(obj, default=_default)
+
+
+def _dumps_stdlib(obj) -> bytes:
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+_BACKENDS = {
+    "orjson": (orjson, _dumps_orjson),
+    "json": (json, _dumps_stdlib),
+}
+
+
+def _select_backend(name: str):
+    """
+    Pick the encoder for config.JSON_BACKEND
+
+    Args:
+        name: 'auto' for the fastest installed backend, or 'orjson' or 'json'
+
+    Returns:
+        Tuple of (backend name, dumps function)
+    """
+    if name != "auto":
+        module, dumps = _BACKENDS.get(name, (None, None))
+        if module is not None:
+            return name, dumps
+        print(f"⚠️  JSON backend '{name}' is not available, picking the fastest installed one")
+
+    for backend, (module, dumps) in _BACKENDS.items():
+        if module is not None:
+            return backend, dumps
+
+
+# dumps(obj) -> bytes: encode with the selected backend; datetimes and objects with
+# to_dict() are allowed anywhere in obj
+BACKEND, dumps = _select_backend(config.JSON_BACKEND)
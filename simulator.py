@@ -1,83 +1,49 @@
 """
 Main simulation logic for replaying object updates in real-time
 """
+import math
 import time
+import bisect
+import heapq
+from concurrent.futures import ThreadPoolExecutor
 import requests
-import math
-from datetime import datetime
-from typing import List, Dict, Any, Set
-from google.cloud.firestore_v1._helpers import DatetimeWithNanoseconds
+from array import array
+from typing import List, Dict, Any, Set, Iterable
 import config
-
-
-def convert_timestamps_to_iso(obj):
-    """
-    Recursively convert DatetimeWithNanoseconds objects to ISO format strings
-    
-    Args:
-        obj: Object that may contain datetime objects
-        
-    Returns:
-        Object with all datetimes converted to ISO strings
-    """
-    if isinstance(obj, (DatetimeWithNanoseconds, datetime)):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {key: convert_timestamps_to_iso(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_timestamps_to_iso(item) for item in obj]
-    else:
-        return obj
-
-
-def calculate_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """
-    Calculate the bearing (rotation) from point 1 to point 2 in degrees.
-    
-    Args:
-        lat1: Latitude of the first point
-        lon1: Longitude of the first point
-        lat2: Latitude of the second point
-        lon2: Longitude of the second point
-        
-    Returns:
-        Bearing in degrees (0-360), where 0 is North, 90 is East, 180 is South, 270 is West
-    """
-    # Convert to radians
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    lon_diff_rad = math.radians(lon2 - lon1)
-
-    # Calculate bearing
-    x = math.sin(lon_diff_rad) * math.cos(lat2_rad)
-    y = math.cos(lat1_rad) * math.sin(lat2_rad) - \
-        math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(lon_diff_rad)
-
-    bearing_rad = math.atan2(x, y)
-    bearing_deg = math.degrees(bearing_rad)
-
-    # Normalize to 0-360
-    bearing_deg = (bearing_deg + 360) % 360
-
-    return bearing_deg
+import transport
+import serialization
+import geodesy
+from engine import SimulationEngine
+from scenario import CompiledScenario, ScenarioTimeline, TrackPoint, to_epoch
 
 
 class ObjectSimulator:
-    def __init__(self, courses: List[Dict[str, Any]]):
+    def __init__(self, courses):
         """
         Initialize the simulator with course data
         
         Args:
-            courses: List of course objects with their points
+            courses: Course objects with their points (a list, or an iterator such as
+                scenario.iter_courses that is consumed once), or a CompiledScenario
+                whose points are decoded only as the simulation reaches them
         """
         self.courses = courses
-        self.all_points = []
+        self.course_ids = []  # Object ID of each course
+        self.all_points = []  # Every point as a TrackPoint, in time order (decoded on access for a CompiledScenario)
+        self.point_courses = array('I')  # Course index of each point, parallel to all_points
+        self.relative_times = array('d')  # Seconds from ground zero, parallel to all_points
         self.start_time = None
         self.current_simulation_time = 0
-        self.processed_point_indices = set()
+        self.next_point_index = 0  # Cursor into all_points: everything before it has been processed
         self.object_states = {}  # Store current state of each object
+        self.final_point_index = {}  # Position of each object's last point in all_points
         self.last_update_time = {}  # Track last update time for each object
         self.classification_sent = set()  # Track which objects have had classification sent
+        self.objects_marked_deleted = set()  # Objects already reported as deleted
+        self.sent_plot_counts = {}  # Number of plots the API already has for each object (delta mode)
+        self.updates_since_keyframe = {}  # Delta updates sent since each object's last full snapshot
+        self.plot_cache = {}  # Plots already built for each object, see transform_to_schema
+        self._send_executor = None  # Thread pool for concurrent sends, created on first use
 
     def prepare_simulation(self):
         """
@@ -85,85 +51,216 @@ class ObjectSimulator:
         """
         print("Preparing simulation...")
 
+        if isinstance(self.courses, CompiledScenario):
+            self._load_compiled_timeline()
+        else:
+            self._load_course_timeline()
+
+        if not self.all_points:
+            print("No points found to simulate!")
+            return False
+
+        # Set ground zero (first timestamp)
+        self.start_time = self.all_points[0]['timestamp']
+
+        print(f"Found {len(self.all_points)} total points across {len(self.course_ids)} objects")
+        print(f"Simulation start time (ground 0): {self.start_time}")
+        print(f"Simulation will run for approximately {self._get_total_duration()} seconds")
+
+        return True
+
+    def _load_course_timeline(self):
+        """
+        Build the timeline from course dicts, consuming them one at a time (they may be streamed)
+        """
+        epochs = array('d')  # Epoch seconds of every point, converted once
+        points = []
+        course_ranges = []
         for course in self.courses:
             object_id = course.get('_id')
-            points = course.get('points', [])
 
             # Initialize object state (empty, will be built up during simulation)
             self.object_states[object_id] = {
                 **{k: v for k, v in course.items() if k != 'points'},
                 'points': []
             }
+            self.course_ids.append(object_id)
+
+            # Points are kept as slotted TrackPoints; the course's dicts are dropped
+            course_points = [TrackPoint(point) for point in course.get('points', []) if 'timestamp' in point]
+            course_epochs = [to_epoch(point.timestamp) for point in course_points]
+            # Courses are generated in time order; anything else is sorted here (stably)
+            if any(a > b for a, b in zip(course_epochs, course_epochs[1:])):
+                by_time = sorted(range(len(course_points)), key=course_epochs.__getitem__)
+                course_points = [course_points[i] for i in by_time]
+                course_epochs = [course_epochs[i] for i in by_time]
+
+            start = len(points)
+            points.extend(course_points)
+            epochs.extend(course_epochs)
+            course_ranges.append(range(start, len(points)))
+
+        order = self._build_timeline(epochs, course_ranges)
+        self.all_points = [points[row] for row in order]
+
+    def _load_compiled_timeline(self):
+        """
+        Build the timeline of a CompiledScenario without decoding its points
+        
+        all_points becomes a ScenarioTimeline that decodes each point when the
+        simulation reaches it, and relative times come straight from the time column.
+        """
+        scenario = self.courses
+        for index in range(len(scenario)):
+            course = scenario.course_meta(index)
+            self.object_states[course.get('_id')] = {**course, 'points': []}
+            self.course_ids.append(course.get('_id'))
 
-            # Add each point to the all_points list with its parent object ID
-            for point in points:
-                if 'timestamp' in point:
-                    self.all_points.append({
-                        'object_id': object_id,
-                        'point_data': point,
-                        'timestamp': point['timestamp']
-                    })
+        order = self._build_timeline(scenario.columns['time'], scenario.course_ranges())
+        self.all_points = ScenarioTimeline(scenario, order)
 
-        # Sort all points by timestamp
-        self.all_points.sort(key=lambda p: p['timestamp'])
+    def _build_timeline(self, epochs, course_ranges: List[range]) -> array:
+        """
+        Merge the per-course timelines into the global one
+        
+        Sets point_courses, relative_times and final_point_index for the merged order.
+        
+        Args:
+            epochs: UTC epoch seconds of every point, indexed by row
+            course_ranges: Rows of each course, in time order within the course
+            
+        Returns:
+            Row numbers in global time order
+        """
+        # k-way merge, O(N log K); ties keep course order like a stable sort would
+        order = array('I', heapq.merge(*course_ranges, key=epochs.__getitem__))
 
-        if not self.all_points:
-            print("No points found to simulate!")
-            return False
+        row_course = array('I', bytes(4 * len(epochs)))
+        for course_index, rows in enumerate(course_ranges):
+            row_course[rows.start:rows.stop] = array('I', [course_index]) * len(rows)
+        self.point_courses = array('I', (row_course[row] for row in order))
 
-        # Set ground zero (first timestamp)
-        self.start_time = self.all_points[0]['timestamp']
+        # Precompute every point's offset from ground zero once, so ticks never touch datetimes.
+        # Epoch floats carry the source's microsecond precision; rounding to it gives the
+        # same offsets as subtracting datetimes
+        if order:
+            start_epoch = epochs[order[0]]
+            self.relative_times = array('d', (round(epochs[row] - start_epoch, 6) for row in order))
 
-        print(f"Found {len(self.all_points)} total points across {len(self.courses)} objects")
-        print(f"Simulation start time (ground 0): {self.start_time}")
-        print(f"Simulation will run for approximately {self._get_total_duration()} seconds")
+        for idx, course_index in enumerate(self.point_courses):
+            self.final_point_index[self.course_ids[course_index]] = idx
 
-        return True
+        return order
 
     def _get_total_duration(self) -> float:
         """Calculate total simulation duration in seconds"""
-        if not self.all_points:
+        if not self.relative_times:
             return 0
-        last_time = self.all_points[-1]['timestamp']
-        delta = last_time - self.start_time
-        return delta.total_seconds()
+        return self.relative_times[-1]
 
-    def _get_relative_time(self, timestamp) -> float:
+    def _get_points_to_process(self) -> range:
         """
-        Get relative time in seconds from ground zero
+        Get all points that became due since the previous tick
+
+        all_points is sorted by timestamp, so the due points are always the
+        contiguous slice between the cursor and the current simulation time.
         
-        Args:
-            timestamp: DatetimeWithNanoseconds object
-            
         Returns:
-            Seconds since start_time
+            Positions of the due points in all_points
         """
-        delta = timestamp - self.start_time
-        return delta.total_seconds()
+        end_index = bisect.bisect_right(
+            self.relative_times, self.current_simulation_time, lo=self.next_point_index
+        )
+        due = range(self.next_point_index, end_index)
+        self.next_point_index = end_index
 
-    def _get_points_to_process(self) -> List[Dict[str, Any]]:
+        return due
+
+    def _apply_due_points(self) -> List[str]:
         """
-        Get all points that should be processed at current simulation time
+        Add every point that became due to its object's state
         
         Returns:
-            List of point data with object IDs
+            IDs of the objects that received new points, in first-seen order
         """
-        points_to_add = []
+        points_to_process = self._get_points_to_process()
+        if not points_to_process:
+            return []
 
-        for idx, point_entry in enumerate(self.all_points):
-            if idx in self.processed_point_indices:
-                continue
+        print(f"[T+{self.current_simulation_time:.1f}s] Processing {len(points_to_process)} points...")
 
-            relative_time = self._get_relative_time(point_entry['timestamp'])
+        updated_ids = {}
+        for idx in points_to_process:
+            object_id = self.course_ids[self.point_courses[idx]]
+            self._update_object_state(object_id, self.all_points[idx])
+            updated_ids[object_id] = None
 
-            if relative_time <= self.current_simulation_time:
-                points_to_add.append({
-                    'index': idx,
-                    'object_id': point_entry['object_id'],
-                    'point': point_entry['point_data']
-                })
+        return list(updated_ids)
 
-        return points_to_add
+    def _take_inactive_objects(self) -> Set[str]:
+        """
+        Find objects that just became inactive and mark them as deleted
+        
+        Returns:
+            Set of object IDs that need a deletion marker this tick
+        """
+        inactive_objects = self._check_inactive_objects() - self.objects_marked_deleted
+        for object_id in inactive_objects:
+            print(f"[T+{self.current_simulation_time:.1f}s] Marking inactive object as deleted...")
+        self.objects_marked_deleted.update(inactive_objects)
+        return inactive_objects
+
+    def seek(self, offset: float):
+        """
+        Jump to an arbitrary simulation time, rebuilding object states in bulk
+        
+        The target position in the timeline is found by binary search, and only the
+        points between the cursor and the target are applied (all points up to the
+        target when seeking backwards), without sending anything per tick.
+        
+        Args:
+            offset: Simulation time to jump to, in seconds from ground zero
+            
+        Returns:
+            Tuple of (object IDs active at the offset, which need a full snapshot,
+            object IDs that were visible before the seek but no longer are)
+        """
+        if not math.isfinite(offset):
+            raise ValueError(f"seek offset must be a finite number, got {offset}")
+        offset = min(max(offset, 0.0), self._get_total_duration())
+        visible_before = set(self.last_update_time) - self.objects_marked_deleted
+
+        target_index = bisect.bisect_right(self.relative_times, offset)
+        if target_index < self.next_point_index:
+            # Seeking backwards: rebuild from ground zero
+            for state in self.object_states.values():
+                state['points'] = []
+            self.last_update_time.clear()
+            self.objects_marked_deleted.clear()
+            self.plot_cache.clear()
+            self.next_point_index = 0
+
+        for idx in range(self.next_point_index, target_index):
+            object_id = self.course_ids[self.point_courses[idx]]
+            if object_id in self.object_states:
+                self.object_states[object_id]['points'].append(self.all_points[idx])
+                self.last_update_time[object_id] = self.relative_times[idx]
+
+        self.next_point_index = target_index
+        self.current_simulation_time = offset
+
+        # Objects that went quiet before the offset are gone, everything else gets resent in full
+        self.objects_marked_deleted.update(self._check_inactive_objects())
+        active_ids = set(self.last_update_time) - self.objects_marked_deleted
+        for object_id in visible_before | active_ids:
+            self.sent_plot_counts.pop(object_id, None)
+        # Objects that finished before the offset and were never shown get no deletion marker
+        self._release_finished_objects(self.objects_marked_deleted - visible_before)
+
+        print(f"[T+{offset:.1f}s] Seeked to point {target_index}/{len(self.all_points)}: "
+              f"{len(active_ids)} active objects")
+
+        return active_ids, visible_before - active_ids
 
     def _update_object_state(self, object_id: str, point: Dict[str, Any]):
         """
@@ -177,46 +274,248 @@ class ObjectSimulator:
             self.object_states[object_id]['points'].append(point)
             self.last_update_time[object_id] = self.current_simulation_time
 
-    def _send_object_update(self, object_id: str, is_delete: bool = False):
+    def _build_object_update(self, object_id: str, is_delete: bool = False):
         """
-        Send object data to the REST API
+        Build the API body for one object update
         
         Args:
             object_id: The object ID
             is_delete: Whether this is a deletion marker
+            
+        Returns:
+            Tuple of (raw payload, schema body, the schema body encoded as JSON bytes,
+            whether the body is a full snapshot)
         """
-        url = f"{config.API_BASE_URL}{config.OBJECTS_ENDPOINT}"
-
         payload = {
             'object_id': object_id,
             'is_delete': is_delete
         }
 
+        is_keyframe = True
         if not is_delete:
             # Include full object data
             payload.update(self.object_states[object_id])
+            is_keyframe = self._needs_keyframe(object_id)
+
+        # Transform to schema (in delta mode, only the plots the API hasn't seen yet)
+        plots_from = 0 if is_keyframe else self.sent_plot_counts[object_id]
+        payload_good = self.transform_to_schema(payload, plots_from=plots_from, plot_cache=self.plot_cache)
+        if config.UPDATE_MODE == 'delta' and not is_delete:
+            payload_good["update_type"] = "full" if is_keyframe else "delta"
+
+        body = self._encode_object_update(payload_good, plots_from)
+
+        return payload, payload_good, body, is_keyframe
+
+    def _encode_object_update(self, payload_good: Dict[str, Any], plots_from: int) -> bytes:
+        """
+        Encode a schema body as JSON, reusing the cached encoding of every plot
+        
+        Each plot is encoded once, the first time it is sent, and the plots array is
+        assembled from those fragments, so historical plots are never re-encoded.
+        
+        Args:
+            payload_good: Schema body from transform_to_schema
+            plots_from: Index of the body's first plot in the object's plot cache
+            
+        Returns:
+            The body as UTF-8 JSON bytes
+        """
+        plots = payload_good['plots']
+        cached = self.plot_cache.get(payload_good['id'])
+        if not plots or cached is None:
+            return serialization.dumps(payload_good)
+
+        encoded = cached['encoded']
+        for plot in cached['plots'][len(encoded):]:
+            encoded.append(serialization.dumps(plot))
+
+        head = serialization.dumps({k: v for k, v in payload_good.items() if k != 'plots'})
+        return b''.join([
+            head[:-1], b',"plots":[',
+            b','.join(encoded[plots_from:plots_from + len(plots)]),
+            b']}'
+        ])
+
+    def _on_object_update_sent(self, object_id: str, is_delete: bool, payload, payload_good, is_keyframe: bool):
+        """
+        Bookkeeping after the API accepted an object update
+        
+        Args:
+            object_id: The object ID
+            is_delete: Whether this was a deletion marker
+            payload: The raw payload the body was built from
+            payload_good: The schema body that was sent
+            is_keyframe: Whether the body was a full snapshot
+        """
+        if is_delete:
+            self.sent_plot_counts.pop(object_id, None)
+        else:
+            self._record_sent_plots(object_id, is_keyframe)
+
+        action = "DELETED" if is_delete else "UPDATED"
+        print(f"  [{action}] Object {object_id} - Points: {len(self.object_states[object_id]['points'])}")
 
-        # Transform to schema
-        payload_good = self.transform_to_schema(payload)
+        if is_delete:
+            self._release_finished_objects([object_id])
+        
+        # Check if we need to send a classification suggestion (only once on first update)
+        if (not is_delete and 
+            self.object_states[object_id].get('should_classify') and
+            object_id not in self.classification_sent):
+            self._send_classification_suggestion(object_id, payload_good, payload)
+            self.classification_sent.add(object_id)  # Mark as sent
+
+    def _send_object_update(self, object_id: str, is_delete: bool = False):
+        """
+        Send object data to the REST API
+        
+        Args:
+            object_id: The object ID
+            is_delete: Whether this is a deletion marker
+        """
+        url = f"{config.API_BASE_URL}{config.OBJECTS_ENDPOINT}"
+        payload, payload_good, body, is_keyframe = self._build_object_update(object_id, is_delete)
         
         try:
             # Send the main object update
-            response = requests.post(url, json=payload_good)
+            response = transport.post(url, data=body, headers=transport.JSON_HEADERS)
             response.raise_for_status()
 
-            action = "DELETED" if is_delete else "UPDATED"
-            print(f"  [{action}] Object {object_id} - Points: {len(self.object_states[object_id]['points'])}")
-            
-            # Check if we need to send a classification suggestion (only once on first update)
-            if (not is_delete and 
-                self.object_states[object_id].get('should_classify') and
-                object_id not in self.classification_sent):
-                self._send_classification_suggestion(object_id, payload_good, payload)
-                self.classification_sent.add(object_id)  # Mark as sent
+            self._on_object_update_sent(object_id, is_delete, payload, payload_good, is_keyframe)
 
         except requests.exceptions.RequestException as e:
             print(f"  [ERROR] Failed to send update for {object_id}: {e}")
-    
+
+    def _send_batch_update(self, updated_ids: Iterable[str], deleted_ids: Iterable[str]):
+        """
+        Send all of a tick's updates and deletions in a single request
+        
+        The body is {"sim_time": ..., "updates": [...]}, where each entry is exactly
+        the body that would have been posted to OBJECTS_ENDPOINT for that object.
+        
+        Args:
+            updated_ids: Objects that received new points this tick
+            deleted_ids: Objects to mark as deleted this tick
+        """
+        entries = [(object_id, False) for object_id in updated_ids]
+        entries.extend((object_id, True) for object_id in deleted_ids)
+        if not entries:
+            return
+
+        url = f"{config.API_BASE_URL}{config.BATCH_ENDPOINT}"
+        built = [(object_id, is_delete, *self._build_object_update(object_id, is_delete))
+                 for object_id, is_delete in entries]
+        body = b''.join([
+            b'{"sim_time":', serialization.dumps(self.current_simulation_time),
+            b',"updates":[', b','.join(entry_body for _, _, _, _, entry_body, _ in built), b']}'
+        ])
+
+        try:
+            response = transport.post(url, data=body, headers=transport.JSON_HEADERS)
+            response.raise_for_status()
+
+            print(f"  [BATCH] Sent {len(built)} object updates in one request")
+            for object_id, is_delete, payload, payload_good, _, is_keyframe in built:
+                self._on_object_update_sent(object_id, is_delete, payload, payload_good, is_keyframe)
+
+        except requests.exceptions.RequestException as e:
+            print(f"  [ERROR] Failed to send batch of {len(built)} updates: {e}")
+
+    def _send_tick_updates(self, updated_ids: Iterable[str], deleted_ids: Iterable[str]):
+        """
+        Send a tick's object updates and deletions using the configured SEND_MODE
+        
+        Args:
+            updated_ids: Objects that received new points this tick
+            deleted_ids: Objects to mark as deleted this tick
+        """
+        if config.SEND_MODE == 'batch':
+            self._send_batch_update(updated_ids, deleted_ids)
+        else:
+            self._send_object_updates(updated_ids)
+            self._send_object_updates(deleted_ids, is_delete=True)
+
+    def _send_object_updates(self, object_ids: Iterable[str], is_delete: bool = False):
+        """
+        Send updates for several objects concurrently and wait until all are done
+        
+        At most config.MAX_CONCURRENT_SENDS requests are in flight at once.
+        
+        Args:
+            object_ids: The object IDs to send
+            is_delete: Whether these are deletion markers
+        """
+        object_ids = list(object_ids)
+        if config.MAX_CONCURRENT_SENDS <= 1 or len(object_ids) <= 1:
+            for object_id in object_ids:
+                self._send_object_update(object_id, is_delete=is_delete)
+            return
+
+        if self._send_executor is None:
+            self._send_executor = ThreadPoolExecutor(
+                max_workers=config.MAX_CONCURRENT_SENDS,
+                thread_name_prefix="object-sender"
+            )
+
+        futures = [
+            self._send_executor.submit(self._send_object_update, object_id, is_delete)
+            for object_id in object_ids
+        ]
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """Release the sender threads"""
+        if self._send_executor is not None:
+            self._send_executor.shutdown(wait=True)
+            self._send_executor = None
+
+    def _release_finished_objects(self, object_ids: Iterable[str]):
+        """
+        Drop the points and plots of deleted objects that have no points left to replay
+        
+        Keeps resident memory proportional to the objects still in the air.
+        
+        Args:
+            object_ids: Objects that were marked as deleted
+        """
+        for object_id in object_ids:
+            if self.final_point_index.get(object_id, -1) < self.next_point_index:
+                self.object_states[object_id]['points'] = []
+                self.plot_cache.pop(object_id, None)
+
+    def _needs_keyframe(self, object_id: str) -> bool:
+        """
+        Decide whether the next update for an object must carry its full plot history
+        
+        Args:
+            object_id: The object ID
+            
+        Returns:
+            True for a full snapshot, False if a delta update is enough
+        """
+        if config.UPDATE_MODE != 'delta' or object_id not in self.sent_plot_counts:
+            return True
+        if config.KEYFRAME_INTERVAL > 0:
+            return self.updates_since_keyframe.get(object_id, 0) >= config.KEYFRAME_INTERVAL
+        return False
+
+    def _record_sent_plots(self, object_id: str, is_keyframe: bool):
+        """
+        Remember how many plots the API has for an object after a successful update
+        
+        Args:
+            object_id: The object ID
+            is_keyframe: Whether the update was a full snapshot
+        """
+        # The last point is sent as the current position, not as a plot
+        self.sent_plot_counts[object_id] = max(len(self.object_states[object_id]['points']) - 1, 0)
+        if is_keyframe:
+            self.updates_since_keyframe[object_id] = 0
+        else:
+            self.updates_since_keyframe[object_id] = self.updates_since_keyframe.get(object_id, 0) + 1
+
     def _send_classification_suggestion(self, object_id: str, schema_obj: Dict[str, Any], payload):
         """
         Send a classification suggestion for an object
@@ -290,7 +589,7 @@ class ObjectSimulator:
         }
         
         try:
-            response = requests.post(classification_url, json=classification_payload)
+            response = transport.post_json(classification_url, classification_payload)
             response.raise_for_status()
             if payload.get("name") == "ב149":
                 time.sleep(10)
@@ -299,12 +598,16 @@ class ObjectSimulator:
             print(f"  [ERROR] Failed to send classification for {object_id}: {e}")
 
     @staticmethod
-    def transform_to_schema(firebase_obj):
+    def transform_to_schema(firebase_obj, plots_from: int = 0, plot_cache: Dict[str, Dict[str, Any]] = None):
         """
         Transform Firebase object to the target API schema.
 
         Args:
             firebase_obj: The Firebase document object with children
+            plots_from: Index of the first plot to include (earlier plots are omitted)
+            plot_cache: Optional per-object cache of built plots, keyed by object ID. Points
+                are assumed to be append-only, so only points beyond the cached count are
+                transformed; a shorter point list than cached rebuilds the entry.
 
         Returns:
             dict: Transformed object matching the target schema
@@ -318,41 +621,17 @@ class ObjectSimulator:
         starting_lon = starting_point.get('lon', 0)
         starting_altitude = firebase_obj.get('points', [{}])[0].get('altitude', 0) if firebase_obj.get('points') else 0
 
-        # Transform points to plots
-        plots = []
+        # Transform points to plots, reusing the plots already built for this object
         points = firebase_obj.get('points', [])
+        cached = plot_cache.get(obj_id) if plot_cache is not None else None
+        if cached is None or cached['count'] > len(points):
+            cached = {'count': 0, 'plots': [], 'encoded': []}
+            if plot_cache is not None and points:
+                plot_cache[obj_id] = cached
+        ObjectSimulator._extend_plots(cached, points, firebase_obj.get("color_on_map"))
 
-        prev_point = None
-        for i, point in enumerate(points):
-            # Use rotation from point data if available, otherwise calculate it
-            rotation = point.get('rotation')
-            if rotation is None:
-                rotation = 0
-                if prev_point is not None:
-                    prev_lat = prev_point.get('lat', 0)
-                    prev_lon = prev_point.get('lon', 0)
-                    curr_lat = point.get('lat', 0)
-                    curr_lon = point.get('lon', 0)
-
-                    # Only calculate if points are different
-                    if (prev_lat != curr_lat or prev_lon != curr_lon):
-                        rotation = calculate_bearing(prev_lat, prev_lon, curr_lat, curr_lon) - 90
-
-            plot = {
-                "position": [
-                    point.get('lon', 0),
-                    point.get('lat', 0),
-                    point.get('altitude', 0)
-                ],
-                "time": point.get('timestamp').isoformat() if point.get('timestamp') and not isinstance(point.get('timestamp'), str) else "",
-                "color": firebase_obj.get("color_on_map"),
-                "rotation": rotation
-            }
-            plots.append(plot)
-            prev_point = point
-
-        # Remove last point from plots
-        plots = plots[:-1]
+        # Remove last point from plots, and any plots the receiver already has
+        plots = cached['plots'][plots_from:len(points) - 1]
 
         # Get rotation for the current position (last point)
         last_rotation = 0
@@ -369,7 +648,7 @@ class ObjectSimulator:
                     curr_lon = points[-1].get('lon', 0)
 
                     if (prev_lat != curr_lat or prev_lon != curr_lon):
-                        last_rotation = calculate_bearing(prev_lat, prev_lon, curr_lat, curr_lon) - 90
+                        last_rotation = geodesy.bearing(prev_lat, prev_lon, curr_lat, curr_lon) - 90
 
         # Prepare classification based on object type
         classification = None
@@ -418,23 +697,54 @@ class ObjectSimulator:
         if details.get("total_distance"):
             details.pop("total_distance")
 
-        details = ObjectSimulator.convert_datetimes_to_iso(details)
         if firebase_obj.get("object_type"):
             details["type"] = firebase_obj["object_type"]
         schema_obj["details"] = details
         
         return schema_obj
     @staticmethod
-    def convert_datetimes_to_iso(obj):
-        """Recursively convert all datetime/date objects in a dict or list to ISO format strings."""
-        if isinstance(obj, dict):
-            return {k: ObjectSimulator.convert_datetimes_to_iso(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [ObjectSimulator.convert_datetimes_to_iso(i) for i in obj]
-        elif isinstance(obj, (datetime)):
-            return obj.isoformat()
-        else:
-            return obj
+    def _extend_plots(cached: Dict[str, Any], points: List[Dict[str, Any]], color):
+        """
+        Transform the points beyond cached['count'] into plots and append them to the cache
+        
+        Args:
+            cached: Cache entry with the number of transformed points and their plots
+            points: The object's full point list
+            color: Map color for the plots
+        """
+        start = cached['count']
+        prev_point = points[start - 1] if start > 0 else None
+        for i in range(start, len(points)):
+            point = points[i]
+            # Use rotation from point data if available, otherwise calculate it
+            rotation = point.get('rotation')
+            if rotation is None:
+                rotation = 0
+                if prev_point is not None:
+                    prev_lat = prev_point.get('lat', 0)
+                    prev_lon = prev_point.get('lon', 0)
+                    curr_lat = point.get('lat', 0)
+                    curr_lon = point.get('lon', 0)
+
+                    # Only calculate if points are different
+                    if (prev_lat != curr_lat or prev_lon != curr_lon):
+                        rotation = geodesy.bearing(prev_lat, prev_lon, curr_lat, curr_lon) - 90
+
+            plot = {
+                "position": [
+                    point.get('lon', 0),
+                    point.get('lat', 0),
+                    point.get('altitude', 0)
+                ],
+                "time": point.get('timestamp').isoformat() if point.get('timestamp') and not isinstance(point.get('timestamp'), str) else "",
+                "color": color,
+                "rotation": rotation
+            }
+            cached['plots'].append(plot)
+            prev_point = point
+
+        cached['count'] = len(points)
+
     def _check_inactive_objects(self) -> Set[str]:
         """
         Check for objects that haven't been updated recently
@@ -454,71 +764,17 @@ class ObjectSimulator:
 
         return inactive_objects
 
-    def run(self):
+    def run(self, time_scale: float = None) -> bool:
         """
         Main simulation loop
         
         Note: Drone attacks are now triggered manually via trigger_drone_attack.py
+        
+        Args:
+            time_scale: Replay speed (1 = real time, 0 = as fast as possible),
+                defaults to config.TIME_SCALE
+        
+        Returns:
+            True if the whole scenario was replayed
         """
-        if not self.prepare_simulation():
-            return
-
-        print("\n" + "=" * 60)
-        print("Starting simulation...")
-        print("=" * 60 + "\n")
-
-        real_start_time = time.time()
-        total_duration = self._get_total_duration()
-        objects_marked_deleted = set()
-
-        while self.current_simulation_time <= total_duration:
-            tick_start = time.time()
-
-            # Get points that should be processed at this time
-            points_to_process = self._get_points_to_process()
-
-            if points_to_process:
-                print(f"[T+{self.current_simulation_time:.1f}s] Processing {len(points_to_process)} points...")
-
-                # Group points by object ID
-                updates_by_object = {}
-                for item in points_to_process:
-                    obj_id = item['object_id']
-                    if obj_id not in updates_by_object:
-                        updates_by_object[obj_id] = []
-                    updates_by_object[obj_id].append(item)
-
-                # Update each object and send to API
-                for object_id, items in updates_by_object.items():
-                    for item in items:
-                        self._update_object_state(object_id, item['point'])
-                        self.processed_point_indices.add(item['index'])
-
-                    # Send update after all points for this tick are added
-                    self._send_object_update(object_id)
-
-            # Check for inactive objects
-            inactive_objects = self._check_inactive_objects()
-            for object_id in inactive_objects:
-                if object_id not in objects_marked_deleted:
-                    print(f"[T+{self.current_simulation_time:.1f}s] Marking inactive object as deleted...")
-                    self._send_object_update(object_id, is_delete=True)
-                    objects_marked_deleted.add(object_id)
-
-            # Move to next time step
-            self.current_simulation_time += config.TICK_INTERVAL
-
-            # Sleep to maintain real-time simulation
-            elapsed = time.time() - tick_start
-            sleep_time = max(0, config.TICK_INTERVAL - elapsed)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-        
-        # Final summary
-        print("\n" + "=" * 60)
-        print("Simulation complete!")
-        print("=" * 60)
-        print(f"Total simulation time: {total_duration:.1f} seconds")
-        print(f"Total real time: {time.time() - real_start_time:.1f} seconds")
-        print(f"Total points processed: {len(self.processed_point_indices)}")
-        print(f"Objects marked as deleted: {len(objects_marked_deleted)}")
+        return SimulationEngine(self, time_scale=time_scale).run()
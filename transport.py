@@ -0,0 +1,95 @@
+"""
+Shared HTTP transport for all outbound requests
+
+Every sender posts through one pooled requests.Session so connections to the
+target API are reused across ticks instead of being opened per request.
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+import serialization
+
+# Headers for bodies that are already encoded (post with data=...)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session() -> requests.Session:
+    """
+    Build a session with connection pooling, keep-alive and retries from config
+    
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+
+    # Only retry connection errors, 502 and 503. A read timeout or a 504 may come after
+    # the upstream already handled the request, so those POSTs are never replayed
+    retry = Retry(
+        total=config.HTTP_RETRIES,
+        connect=config.HTTP_RETRIES,
+        read=0,
+        status=config.HTTP_RETRIES,
+        backoff_factor=config.HTTP_BACKOFF,
+        status_forcelist=(502, 503),
+        allowed_methods=None,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_SIZE,
+        pool_maxsize=config.HTTP_POOL_SIZE,
+        max_retries=retry
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    if not config.HTTP_KEEP_ALIVE:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """
+    POST through the shared session, applying the configured timeout
+    
+    Args:
+        url: Target URL
+        **kwargs: Passed through to requests.Session.post (json, data, headers, ...)
+        
+    Returns:
+        The response object
+    """
+    kwargs.setdefault("timeout", config.HTTP_TIMEOUT)
+    return get_session().post(url, **kwargs)
+
+
+def post_json(url: str, payload, **kwargs) -> requests.Response:
+    """
+    POST a payload encoded with the shared serializer (see serialization.py)
+    
+    Args:
+        url: Target URL
+        payload: JSON-compatible data, may contain datetimes
+        **kwargs: Passed through to post
+        
+    Returns:
+        The response object
+    """
+    return post(url, data=serialization.dumps(payload), headers=JSON_HEADERS, **kwargs)
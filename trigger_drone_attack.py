@@ -12,14 +12,14 @@ import os
 import time
 import requests
 import json
-from datetime import datetime, timedelta
 
-from config import API_BASE_URL
+from config import API_BASE_URL, SCENARIO_SEED
 
 # Add path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'dataaa', 'genareft'))
 
 from all import create_drone_track_simulation, send_radar_points_with_timing
+from scenario import convert_timestamps
 
 def send_drone_track_to_api():
     """
@@ -33,7 +33,7 @@ def send_drone_track_to_api():
     print("="*60)
     
     # Create the drone track with proper timing (appears at current time + 1 second)
-    drone_track = create_drone_track_simulation(offset_seconds=10)
+    drone_track = create_drone_track_simulation(offset_seconds=10, seed=SCENARIO_SEED)
     
     print(f"✅ Drone track created:")
     print(f"   ID: {drone_track['_id']}")
@@ -75,28 +75,6 @@ def send_drone_track_to_api():
     
     return True
 
-def convert_timestamps(obj):
-    """Recursively convert all timestamp fields in the data into datetime objects."""
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            # Convert known timestamp formats
-            if isinstance(value, str):
-                try:
-                    # Try parsing ISO-style timestamps
-                    obj[key] = datetime.fromisoformat(value.replace("Z", "+00:00"))
-                except ValueError:
-                    pass
-            elif isinstance(value, dict) and "seconds" in value and "nanoseconds" in value:
-                # Firebase timestamp format
-                seconds = value["seconds"]
-                nanos = value.get("nanoseconds", 0)
-                obj[key] = datetime.fromtimestamp(seconds + nanos / 1e9, tz=timezone.utc)
-            else:
-                obj[key] = convert_timestamps(value)
-    elif isinstance(obj, list):
-        obj = [convert_timestamps(item) for item in obj]
-    return obj
-
 def main():
     """
     Main function to trigger the drone attack
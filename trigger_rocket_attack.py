@@ -13,45 +13,14 @@ import time
 import requests
 import json
 import uuid
-import math
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 
 # Add path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'dataaa', 'genareft'))
 
 from simulator import ObjectSimulator
-
-
-def haversine(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points in meters"""
-    R = 6371000
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    d_phi = math.radians(lat2 - lat1)
-    d_lambda = math.radians(lon2 - lon1)
-    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
-
-
-def bearing(lat1, lon1, lat2, lon2):
-    """Calculate bearing between two points"""
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    delta_lambda = math.radians(lon2 - lon1)
-    y = math.sin(delta_lambda) * math.cos(phi2)
-    x = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(delta_lambda)
-    return (math.degrees(math.atan2(y, x)) + 360) % 360
-
-
-def move_point(lat, lon, speed, brg, dt=1):
-    """Move a point by distance based on speed and bearing"""
-    R = 6371000
-    distance = speed * dt
-    brg = math.radians(brg)
-    lat1, lon1 = math.radians(lat), math.radians(lon)
-    lat2 = math.asin(math.sin(lat1) * math.cos(distance / R) + math.cos(lat1) * math.sin(distance / R) * math.cos(brg))
-    lon2 = lon1 + math.atan2(math.sin(brg) * math.sin(distance / R) * math.cos(lat1),
-                             math.cos(distance / R) - math.sin(lat1) * math.sin(lat2))
-    return math.degrees(lat2), math.degrees(lon2)
+from scenario import convert_timestamps
+from geodesy import haversine, bearing, move_point
 
 
 def create_rocket_track_simulation(start_lat, start_lon, end_lat, end_lon, offset_seconds=1):
@@ -153,26 +122,6 @@ def create_rocket_track_simulation(start_lat, start_lon, end_lat, end_lon, offse
 
 
 
-def convert_timestamps(obj):
-    """Recursively convert all timestamp fields in the data into datetime objects."""
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            if isinstance(value, str):
-                try:
-                    obj[key] = datetime.fromisoformat(value.replace("Z", "+00:00"))
-                except ValueError:
-                    pass
-            elif isinstance(value, dict) and "seconds" in value and "nanoseconds" in value:
-                seconds = value["seconds"]
-                nanos = value.get("nanoseconds", 0)
-                obj[key] = datetime.fromtimestamp(seconds + nanos / 1e9, tz=timezone.utc)
-            else:
-                obj[key] = convert_timestamps(value)
-    elif isinstance(obj, list):
-        obj = [convert_timestamps(item) for item in obj]
-    return obj
-
-
 def send_rocket_track_to_api():
     """
     Create and send the rocket track directly to the API